@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from datetime import datetime, timedelta
@@ -11,31 +11,13 @@ import pyodbc
 # Load environment variables
 load_dotenv()
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app, supports_credentials=True, resources={
-    r"/*": {
-        "origins": ["http://localhost:5173"],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
-        "expose_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True
-    }
-})
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key-here')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
-
-# Initialize SQLAlchemy
-db = SQLAlchemy(app)
+# Initialize SQLAlchemy; bound to the app in create_app()
+db = SQLAlchemy()
+api = Blueprint('api', __name__)
 
 
 # Test database connection
-@app.route('/test-db')
+@api.route('/test-db')
 def test_db():
     try:
         # Try to connect to the database
@@ -121,7 +103,7 @@ def token_required(f):
             return jsonify({'message': 'Token is missing'}), 401
         try:
             token = token.split(' ')[1]  # Remove 'Bearer ' prefix
-            data = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+            data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
             current_user = User.query.get(data['user_id'])
             if not current_user:
                 return jsonify({'message': 'User not found'}), 401
@@ -133,7 +115,7 @@ def token_required(f):
 
 
 # Routes
-@app.route('/')
+@api.route('/')
 def home():
     return jsonify({
         "message": "Welcome to the API",
@@ -152,7 +134,7 @@ def home():
 
 
 # Auth routes
-@app.route('/api/auth/login', methods=['POST'])
+@api.route('/api/auth/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
@@ -170,8 +152,8 @@ def login():
 
         token = jwt.encode({
             'user_id': user.id,
-            'exp': datetime.utcnow() + app.config['JWT_ACCESS_TOKEN_EXPIRES']
-        }, app.config['JWT_SECRET_KEY'])
+            'exp': datetime.utcnow() + current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+        }, current_app.config['JWT_SECRET_KEY'])
 
         return jsonify({
             'token': token,
@@ -182,7 +164,7 @@ def login():
 
 
 # User routes
-@app.route('/api/user/profile', methods=['GET'])
+@api.route('/api/user/profile', methods=['GET'])
 @token_required
 def get_profile(current_user):
     try:
@@ -191,7 +173,7 @@ def get_profile(current_user):
         return jsonify({'message': f'Failed to get profile: {str(e)}'}), 500
 
 
-@app.route('/users', methods=['GET'])
+@api.route('/users', methods=['GET'])
 @token_required
 def get_all_users(current_user):
     try:
@@ -202,7 +184,7 @@ def get_all_users(current_user):
 
 
 # Area routes
-@app.route('/areas', methods=['GET'])
+@api.route('/areas', methods=['GET'])
 @token_required
 def get_all_areas(current_user):
     try:
@@ -219,7 +201,7 @@ def get_all_areas(current_user):
 
 
 # Branch routes
-@app.route('/branches', methods=['GET'])
+@api.route('/branches', methods=['GET'])
 @token_required
 def get_all_branches(current_user):
     try:
@@ -235,7 +217,7 @@ def get_all_branches(current_user):
         return jsonify({'message': f'Failed to get branches: {str(e)}'}), 500
 
 
-@app.route('/roles', methods=['GET'])
+@api.route('/roles', methods=['GET'])
 @token_required
 def get_all_roles(current_user):
     try:
@@ -249,7 +231,7 @@ def get_all_roles(current_user):
         return jsonify({'message': f'Failed to get roles: {str(e)}'}), 500
 
 
-@app.route('/daily-reports', methods=['GET'])
+@api.route('/daily-reports', methods=['GET'])
 @token_required
 def get_daily_reports(current_user):
     try:
@@ -270,5 +252,42 @@ def get_daily_reports(current_user):
         return jsonify({'message': f'Failed to get daily reports: {str(e)}'}), 500
 
 
+def create_app(config=None):
+    # config (a dict) overrides the environment; serve.py passes per-worker pool sizes
+    app = Flask(__name__)
+    CORS(app, supports_credentials=True, resources={
+        r"/*": {
+            "origins": ["http://localhost:5173"],
+            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"],
+            "expose_headers": ["Content-Type", "Authorization"],
+            "supports_credentials": True
+        }
+    })
+
+    # Database configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key-here')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 10))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds
+    if config:
+        app.config.update(config)
+    engine_options = {'pool_pre_ping': True}
+    if not (app.config['SQLALCHEMY_DATABASE_URI'] or '').startswith('sqlite'):
+        engine_options.update(pool_size=app.config['DB_POOL_SIZE'],
+                              max_overflow=app.config['DB_MAX_OVERFLOW'],
+                              pool_recycle=app.config['DB_POOL_RECYCLE'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+    db.init_app(app)
+    app.register_blueprint(api)
+    return app
+
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only; production runs through serve.py
+    create_app().run(debug=os.getenv('FLASK_DEBUG') == '1')
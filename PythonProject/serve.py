@@ -0,0 +1,87 @@
+"""Production entry point.
+
+Runs the app under gunicorn (Linux) with WEB_WORKERS processes of
+WEB_THREADS threads each, or under waitress (Windows) with WEB_THREADS
+threads. Each worker's connection pool is sized to its thread count unless
+DB_POOL_SIZE is set.
+
+    WEB_WORKERS=8 WEB_THREADS=4 WEB_BIND=0.0.0.0:5000 python serve.py
+
+Graceful restart (gunicorn): kill -HUP <master pid>. With WEB_PRELOAD=1 the
+app is imported once in the master and HUP no longer reloads code.
+"""
+import multiprocessing
+import os
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_preloaded = None
+
+
+def server_settings():
+    threads = int(os.getenv('WEB_THREADS', 4))
+    return {
+        'bind': os.getenv('WEB_BIND', '0.0.0.0:5000'),
+        'workers': int(os.getenv('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1)),
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': os.getenv('WEB_PRELOAD', '0') == '1',
+        'timeout': int(os.getenv('WEB_TIMEOUT', 60)),
+        'graceful_timeout': int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30)),
+        'max_requests': int(os.getenv('WEB_MAX_REQUESTS', 0)),
+        'max_requests_jitter': int(os.getenv('WEB_MAX_REQUESTS_JITTER', 50)),
+    }
+
+
+def worker_config(threads):
+    return {
+        'DB_POOL_SIZE': int(os.getenv('DB_POOL_SIZE', threads)),
+        'DB_MAX_OVERFLOW': int(os.getenv('DB_MAX_OVERFLOW', max(threads // 2, 1))),
+    }
+
+
+def post_fork(server, worker):
+    # Pooled connections must not be shared with the master after fork
+    if _preloaded is not None:
+        from app import db
+        with _preloaded.app_context():
+            db.get_engine(_preloaded).dispose()
+
+
+def run_gunicorn(settings):
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+            self.cfg.set('post_fork', post_fork)
+
+        def load(self):
+            global _preloaded
+            from app import create_app
+            app = create_app(worker_config(settings['threads']))
+            if settings['preload_app']:
+                _preloaded = app
+            return app
+
+    Server().run()
+
+
+def run_waitress(settings):
+    from waitress import serve
+    from app import create_app
+    host, _, port = settings['bind'].rpartition(':')
+    serve(create_app(worker_config(settings['threads'])), host=host or '0.0.0.0', port=int(port),
+          threads=settings['threads'])
+
+
+if __name__ == '__main__':
+    settings = server_settings()
+    if sys.platform == 'win32':
+        run_waitress(settings)
+    else:
+        run_gunicorn(settings)
@@ -37,3 +37,8 @@ ADD CONSTRAINT FK_Daily_Branch
 ALTER TABLE Daily
 ADD CONSTRAINT FK_Daily_Area
 	FOREIGN KEY (areaId) REFERENCES Area(id)
+
+-- Keyset pagination indexes for /api/daily (date, id) listings
+CREATE INDEX IX_Daily_date_id ON Daily (date, id)
+CREATE INDEX IX_Daily_branchId_date_id ON Daily (branchId, date, id)
+CREATE INDEX IX_Daily_areaId_date_id ON Daily (areaId, date, id)
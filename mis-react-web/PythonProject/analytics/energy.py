@@ -0,0 +1,186 @@
+import numpy as np
+from models import db, Daily
+
+FETCH_CHUNK_SIZE = 50000
+
+
+def load_readings(criteria, chunk_size=FETCH_CHUNK_SIZE):
+    # One ordered bulk fetch of just the columns the KPI needs, turned into column arrays.
+    # Ordering by source then date makes every source a contiguous run of rows.
+    query = (
+        db.session.query(
+            Daily.branchId, Daily.sourceType, Daily.sourceName, Daily.date,
+            Daily.electricityConsumption, Daily.productionVolume
+        )
+        .filter(*criteria)
+        .order_by(Daily.branchId, Daily.sourceType, Daily.sourceName, Daily.date)
+    )
+    result = db.session.execute(query.statement)
+    columns = [[] for _ in range(6)]
+    while True:
+        chunk = result.fetchmany(chunk_size)
+        if not chunk:
+            break
+        for column, values in zip(columns, zip(*chunk)):
+            column.extend(values)
+    return {
+        'branchId': np.array(columns[0], dtype=object),
+        'sourceType': np.array(columns[1], dtype=object),
+        'sourceName': np.array(columns[2], dtype=object),
+        'date': np.array(columns[3], dtype='datetime64[D]'),
+        'electricity': np.array(columns[4], dtype=float),  # NULL -> nan
+        'production': np.array(columns[5], dtype=float),
+    }
+
+
+def _starts(changed):
+    # Index of the first row of every run, given a "differs from previous row" mask
+    return np.flatnonzero(changed)
+
+
+def _ratio(numerator, denominator, where):
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=where)
+
+
+def compute_intensity(readings, window=7, z_threshold=3.0):
+    # kWh per m3 per source and day, its rolling mean over the last `window` days with
+    # data, a per-source z-score outlier flag and monthly totals, all without Python loops
+    rows = len(readings['date'])
+    if rows == 0:
+        return None
+
+    new_source = np.zeros(rows, dtype=bool)
+    new_source[0] = True
+    for key in ('branchId', 'sourceType', 'sourceName'):
+        new_source[1:] |= readings[key][1:] != readings[key][:-1]
+    new_day = new_source.copy()
+    new_day[1:] |= readings['date'][1:] != readings['date'][:-1]
+
+    # Several readings for one source and day are summed into a single day
+    day_starts = _starts(new_day)
+    electricity = readings['electricity']
+    production = readings['production']
+    valid = np.isfinite(electricity) & np.isfinite(production)
+    day_electricity = np.add.reduceat(np.where(valid, electricity, 0.0), day_starts)
+    day_production = np.add.reduceat(np.where(valid, production, 0.0), day_starts)
+    day_valid = np.add.reduceat(valid.astype(np.int64), day_starts) > 0
+    day_dates = readings['date'][day_starts]
+    day_new_source = new_source[day_starts]
+    day_source = np.cumsum(day_new_source) - 1
+    intensity = _ratio(day_electricity, day_production, day_valid & (day_production > 0))
+
+    # Rolling mean from prefix sums, clipped so the window never crosses into another source
+    days = len(day_starts)
+    source_first_day = _starts(day_new_source)
+    finite = np.isfinite(intensity)
+    values = np.where(finite, intensity, 0.0)
+    value_sums = np.concatenate(([0.0], np.cumsum(values)))
+    value_counts = np.concatenate(([0], np.cumsum(finite)))
+    index = np.arange(days)
+    lower = np.maximum(index - window + 1, source_first_day[day_source])
+    window_counts = value_counts[index + 1] - value_counts[lower]
+    rolling_mean = _ratio(value_sums[index + 1] - value_sums[lower], window_counts, window_counts > 0)
+
+    # Per-source mean/std through bincount; flag days more than z_threshold deviations away
+    sources = len(source_first_day)
+    counts = np.bincount(day_source, weights=finite, minlength=sources)
+    sums = np.bincount(day_source, weights=values, minlength=sources)
+    squares = np.bincount(day_source, weights=values ** 2, minlength=sources)
+    mean = _ratio(sums, counts, counts > 0)
+    std = np.sqrt(np.maximum(_ratio(squares, counts, counts > 0) - mean ** 2, 0.0))
+    z_score = _ratio(intensity - mean[day_source], std[day_source], finite & (std[day_source] > 0))
+    outlier = np.abs(np.nan_to_num(z_score)) > z_threshold
+
+    day_months = day_dates.astype('datetime64[M]')
+    new_month = day_new_source.copy()
+    new_month[1:] |= day_months[1:] != day_months[:-1]
+    month_starts = _starts(new_month)
+    month_electricity = np.add.reduceat(day_electricity, month_starts)
+    month_production = np.add.reduceat(day_production, month_starts)
+
+    source_electricity = np.add.reduceat(day_electricity, source_first_day)
+    source_production = np.add.reduceat(day_production, source_first_day)
+    source_rows = day_starts[source_first_day]
+
+    return {
+        'sources': {
+            'branchId': readings['branchId'][source_rows],
+            'sourceType': readings['sourceType'][source_rows],
+            'sourceName': readings['sourceName'][source_rows],
+            'days': np.bincount(day_source, minlength=sources),
+            'outlierDays': np.bincount(day_source, weights=outlier, minlength=sources).astype(np.int64),
+            'electricity': source_electricity,
+            'production': source_production,
+            'intensity': _ratio(source_electricity, source_production, source_production > 0),
+        },
+        'days': {
+            'source': day_source,
+            'date': day_dates,
+            'electricity': day_electricity,
+            'production': day_production,
+            'intensity': intensity,
+            'rollingMean': rolling_mean,
+            'zScore': z_score,
+            'outlier': outlier,
+        },
+        'months': {
+            'source': day_source[month_starts],
+            'month': day_months[month_starts],
+            'electricity': month_electricity,
+            'production': month_production,
+            'intensity': _ratio(month_electricity, month_production, month_production > 0),
+        },
+    }
+
+
+def _number(value):
+    value = float(value)
+    return None if np.isnan(value) else round(value, 6)
+
+
+def intensity_report(result, include_days=False):
+    # Turn the column arrays into the JSON shape served by /api/analytics/energy-intensity
+    if result is None:
+        return {'sources': [], 'outliers': []}
+    sources = result['sources']
+    months = result['months']
+    days = result['days']
+
+    report = []
+    for i in range(len(sources['days'])):
+        report.append({
+            'branchId': sources['branchId'][i],
+            'sourceType': sources['sourceType'][i],
+            'sourceName': sources['sourceName'][i],
+            'days': int(sources['days'][i]),
+            'outlierDays': int(sources['outlierDays'][i]),
+            'electricityConsumption': _number(sources['electricity'][i]),
+            'productionVolume': _number(sources['production'][i]),
+            'intensity': _number(sources['intensity'][i]),
+            'monthly': [],
+        })
+    for i in range(len(months['month'])):
+        report[months['source'][i]]['monthly'].append({
+            'month': str(months['month'][i]),
+            'electricityConsumption': _number(months['electricity'][i]),
+            'productionVolume': _number(months['production'][i]),
+            'intensity': _number(months['intensity'][i]),
+        })
+
+    def day_entry(i):
+        source = report[days['source'][i]]
+        return {
+            'branchId': source['branchId'],
+            'sourceType': source['sourceType'],
+            'sourceName': source['sourceName'],
+            'date': str(days['date'][i]),
+            'intensity': _number(days['intensity'][i]),
+            'rollingMean': _number(days['rollingMean'][i]),
+            'zScore': _number(days['zScore'][i]),
+            'outlier': bool(days['outlier'][i]),
+        }
+
+    payload = {'sources': report, 'outliers': [day_entry(i) for i in np.flatnonzero(days['outlier'])]}
+    if include_days:
+        payload['days'] = [day_entry(i) for i in range(len(days['date']))]
+    return payload
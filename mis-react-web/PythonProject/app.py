@@ -1,6 +1,20 @@
 from flask import Flask
 from flask_cors import CORS
+from flask_migrate import Migrate
 from models import db
+from utils.auth import init_principal_cache
+from utils.reference_cache import init_reference_cache
+from utils.branch_cache import init_branch_cache
+from utils.stats import init_dashboard_stats
+from utils.index_check import check_indexes_command
+from utils.passwords import init_password_hasher
+from utils.compression import init_compression
+from utils.json_encoder import init_json
+from utils.export import init_export_cache
+from utils.logging_setup import init_logging, Payload, request_summary
+from utils.metrics import init_metrics
+from utils.database import init_database
+from utils.jobs import init_jobs, purge_jobs_command
 
 # Import all blueprints
 from routes.auth_routes import auth_bp
@@ -16,57 +30,138 @@ from routes.dashboard_routes import dashboard_bp
 from routes.branch_source import branch_source_bp
 from routes.branch_source_name import branch_source_name_bp
 from routes.source_name import source_name_bp
+from routes.analytics_routes import analytics_bp
+from routes.energy_routes import energy_bp
+from routes.export_routes import export_bp
+from routes.metrics_routes import metrics_bp
+from routes.hierarchy_routes import hierarchy_bp
+from routes.job_routes import job_bp
 
+import logging
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-
-# CORS configuration
-CORS(app,
-     resources={r"/api/*": {"origins": ["http://localhost:5173", "http://localhost:5174"]}},
-     supports_credentials=True,
-     allow_headers=["Content-Type", "Authorization"],
-     expose_headers=["Content-Type", "Authorization"],
-     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     max_age=3600
-)
-
-# App configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key-here')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # seconds
-
-# Initialize SQLAlchemy
-db.init_app(app)
-
-# Register blueprints
-app.register_blueprint(auth_bp)
-app.register_blueprint(user_bp)
-app.register_blueprint(area_bp)
-app.register_blueprint(branch_bp)
-app.register_blueprint(source_bp)
-app.register_blueprint(status_bp)
-app.register_blueprint(daily_bp)
-app.register_blueprint(monthly_bp)
-app.register_blueprint(role_bp)
-app.register_blueprint(dashboard_bp)
-app.register_blueprint(branch_source_bp)
-app.register_blueprint(branch_source_name_bp)
-app.register_blueprint(source_name_bp)
-
-# Optionally, add a health check or root endpoint
-@app.route('/')
-def home():
-    return {"message": "API is running!"}
+migrate = Migrate()
+
+
+def create_app(config=None):
+    # config (a dict) overrides the environment; serve.py passes per-worker pool sizes
+    app = Flask(__name__)
+
+    # CORS configuration
+    CORS(app,
+         resources={r"/api/*": {"origins": ["http://localhost:5173", "http://localhost:5174"]}},
+         supports_credentials=True,
+         allow_headers=["Content-Type", "Authorization"],
+         expose_headers=["Content-Type", "Authorization", "X-Sync-Token"],
+         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+         max_age=3600
+    )
+
+    # App configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DATABASE_READ_URL'] = os.getenv('DATABASE_READ_URL')  # optional read-only replica
+    app.config['READ_REPLICA_BLUEPRINTS'] = os.getenv('READ_REPLICA_BLUEPRINTS', 'daily,monthly,analytics,energy,export')
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 10))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', 30))  # seconds
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-jwt-secret-key-here')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # seconds
+    app.config['PRINCIPAL_CACHE_SIZE'] = int(os.getenv('PRINCIPAL_CACHE_SIZE', 1024))
+    app.config['PRINCIPAL_CACHE_TTL'] = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))  # seconds
+    app.config['REFERENCE_CACHE_TTL'] = int(os.getenv('REFERENCE_CACHE_TTL', 300))  # seconds a cached body is kept; versions are checked per request
+    app.config['REFERENCE_CACHE_SIZE'] = int(os.getenv('REFERENCE_CACHE_SIZE', 256))  # cached listing bodies
+    app.config['BRANCH_CACHE_SIZE'] = int(os.getenv('BRANCH_CACHE_SIZE', 1024))  # cached branch details
+    app.config['BCRYPT_ROUNDS'] = int(os.getenv('BCRYPT_ROUNDS', 12))
+    app.config['PASSWORD_WORKERS'] = int(os.getenv('PASSWORD_WORKERS', 2))  # concurrent bcrypt hashes
+    app.config['PASSWORD_MAX_PENDING'] = int(os.getenv('PASSWORD_MAX_PENDING', 64))
+    app.config['PASSWORD_TIMEOUT'] = int(os.getenv('PASSWORD_TIMEOUT', 10))  # seconds
+    app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+    app.config['LOG_ROUTE_LEVELS'] = os.getenv('LOG_ROUTE_LEVELS', '')  # e.g. auth.login=DEBUG
+    app.config['LOG_SAMPLE_RATE'] = float(os.getenv('LOG_SAMPLE_RATE', 1.0))  # share of DEBUG/INFO kept
+    app.config['LOG_QUEUE_SIZE'] = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # records buffered before dropping
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')  # optional bearer token for /api/metrics
+    app.config['DASHBOARD_RECONCILE_INTERVAL'] = int(os.getenv('DASHBOARD_RECONCILE_INTERVAL', 300))  # seconds
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes; smaller bodies go out as-is
+    app.config['COMPRESS_GZIP_LEVEL'] = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    app.config['EXPORT_CACHE_SIZE'] = int(os.getenv('EXPORT_CACHE_SIZE', 16))  # compressed CSV exports kept
+    app.config['EXPORT_CACHE_MAX_BYTES'] = int(os.getenv('EXPORT_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+    app.config['SYNC_TOKEN_LAG'] = int(os.getenv('SYNC_TOKEN_LAG', 5))  # seconds of overlap between delta syncs
+    app.config['JOB_WORKERS'] = int(os.getenv('JOB_WORKERS', 2))  # background jobs run concurrently per process
+    app.config['JOB_MAX_PENDING'] = int(os.getenv('JOB_MAX_PENDING', 32))  # queued + running per process
+    app.config['JOB_RESULT_DIR'] = os.getenv('JOB_RESULT_DIR')  # defaults to <instance>/job-results
+    app.config['JOB_PROGRESS_INTERVAL'] = float(os.getenv('JOB_PROGRESS_INTERVAL', 1))  # seconds between progress writes
+    app.config['JOB_STALE_AFTER'] = int(os.getenv('JOB_STALE_AFTER', 3600))  # seconds without a heartbeat before a job is failed
+    if config:
+        app.config.update(config)
+    init_database(app)
+
+    # orjson behind jsonify and flask.json.dumps
+    init_json(app)
+
+    # Queue-backed logging: request threads never write to stdout themselves
+    app.extensions['log_listener'] = init_logging(app)
+
+    # Initialize SQLAlchemy
+    db.init_app(app)
+    init_metrics(app)
+
+    # Schema migrations (flask db upgrade); see migrations/README
+    migrate.init_app(app, db)
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(purge_jobs_command)
+    init_principal_cache(app)
+    init_reference_cache(app)
+    init_branch_cache(app)
+    init_dashboard_stats(app)
+    init_password_hasher(app)
+    init_export_cache(app)
+    init_compression(app)
+    init_jobs(app)
+
+    # Register blueprints
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(user_bp)
+    app.register_blueprint(area_bp)
+    app.register_blueprint(branch_bp)
+    app.register_blueprint(source_bp)
+    app.register_blueprint(status_bp)
+    app.register_blueprint(daily_bp)
+    app.register_blueprint(monthly_bp)
+    app.register_blueprint(role_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(branch_source_bp)
+    app.register_blueprint(branch_source_name_bp)
+    app.register_blueprint(source_name_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(energy_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(hierarchy_bp)
+    app.register_blueprint(job_bp)
+
+    @app.before_request
+    def log_request_info():
+        # The summary reads the live request, so it is built here, and only when DEBUG can pass
+        if app.logger.isEnabledFor(logging.DEBUG):
+            app.logger.debug('Incoming request: %s', Payload(request_summary()))
+
+    # Optionally, add a health check or root endpoint
+    @app.route('/')
+    def home():
+        return {"message": "API is running!"}
+
+    return app
+
 
 if __name__ == '__main__':
-    print("\n=== Starting Flask Server ===")
-    print("Server running on http://localhost:5000")
-    print("Debug mode:", True)
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only; production runs through serve.py
+    create_app().run(debug=os.getenv('FLASK_DEBUG') == '1')
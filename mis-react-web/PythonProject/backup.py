@@ -2,12 +2,14 @@ from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from datetime import datetime, timedelta
+import logging
 import os
 from dotenv import load_dotenv
 import jwt
 from functools import wraps
 import pyodbc
 from sqlalchemy import text
+from utils.logging_setup import Payload, request_summary
 
 # Load environment variables
 load_dotenv()
@@ -18,13 +20,9 @@ app = Flask(__name__)
 # Add request logging middleware
 @app.before_request
 def log_request_info():
-    print("\n=== Incoming Request ===")
-    print(f"Method: {request.method}")
-    print(f"URL: {request.url}")
-    print(f"Headers: {dict(request.headers)}")
-    if request.is_json:
-        print(f"Body: {request.get_json()}")
-    print("======================\n")
+    # The summary reads the live request, so it is built here, and only when DEBUG can pass
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug('Incoming request: %s', Payload(request_summary()))
 
 # Configure CORS
 CORS(app,
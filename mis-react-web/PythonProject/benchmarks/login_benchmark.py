@@ -0,0 +1,92 @@
+"""Login storm benchmark.
+
+Runs the app against a throwaway SQLite database, fires concurrent logins
+while another set of threads polls /api/status, and prints latency
+percentiles for both. The second number is the one that matters: a login
+burst should not push up the latency of unrelated endpoints.
+
+    python benchmarks/login_benchmark.py --users 200 --logins 400 --threads 32
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'login_bench.db')
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f'n={len(samples)} p50={pick(0.50):.1f}ms p95={pick(0.95):.1f}ms p99={pick(0.99):.1f}ms'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--logins', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost factor')
+    args = parser.parse_args()
+
+    os.environ['BCRYPT_ROUNDS'] = str(args.rounds)
+    from app import create_app
+    from models import db, User, Role, Status
+    from utils.passwords import password_hasher
+
+    app = create_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Role(roleName='Encoder'))
+        db.session.add(Status(statusName='Pending'))
+        stored = password_hasher.hash('secret')
+        for i in range(args.users):
+            db.session.add(User(roleId=1, userName=f'User{i}', passwordHash=stored, isActive=True))
+        db.session.commit()
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'user0', 'password': 'secret'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    login_times, status_times = [], []
+    done = threading.Event()
+
+    def login(i):
+        start = time.perf_counter()
+        response = app.test_client().post('/api/auth/login', json={
+            'username': f'USER{i % args.users}', 'password': 'secret'})
+        login_times.append(time.perf_counter() - start)
+        return response.status_code
+
+    def poll_status():
+        local = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            local.get('/api/status', headers=headers)
+            status_times.append(time.perf_counter() - start)
+
+    pollers = [threading.Thread(target=poll_status) for _ in range(4)]
+    for poller in pollers:
+        poller.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        codes = list(pool.map(login, range(args.logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    for poller in pollers:
+        poller.join()
+
+    print(f'logins:  {percentiles(login_times)} throughput={args.logins / elapsed:.1f}/s '
+          f'ok={codes.count(200)} busy={codes.count(503)}')
+    print(f'status:  {percentiles(status_times)} (concurrent with the login storm)')
+    print(f'median status latency {statistics.median(status_times) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
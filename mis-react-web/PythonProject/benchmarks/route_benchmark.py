@@ -0,0 +1,196 @@
+"""Per-route benchmark across dataset scales.
+
+For every scale, seeds a SQLite database with benchmarks/seed.py (cached in
+--data-dir so reruns skip the seeding), then drives each endpoint of every
+blueprint through the Flask test client from --threads workers and reports
+p50/p95/p99 latency and throughput. Each scale runs in its own process so
+caches and pools start cold and identical.
+
+    python benchmarks/route_benchmark.py --scales small medium --requests 200
+    python benchmarks/route_benchmark.py --output after.json --baseline before.json
+
+--output writes the results as JSON; --baseline prints the p95 change
+against a previous --output file, which is how a change is judged.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import count
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# areas, branches per area, source types, sources per branch, years of history
+SCALES = {
+    'small': (3, 3, 8, 10, 1),
+    'medium': (5, 5, 8, 20, 2),
+    'large': (10, 10, 8, 30, 3),
+}
+
+
+def scenarios():
+    # (name, method, path or path(i), json body(i) or None); POST bodies are unique per call
+    today = datetime.now().date()
+    month_ago = (today - timedelta(days=30)).isoformat()
+    return [
+        ('auth.login', 'POST', '/api/auth/login', lambda i: {'username': f'user{i % 50}', 'password': 'secret'}),
+        ('auth.register', 'POST', '/api/auth/register', lambda i: {
+            'userName': f'bench{i}', 'firstName': 'Bench', 'lastName': str(i), 'email': f'bench{i}@example.com',
+            'password': 'secret', 'roleId': 4, 'areaId': 1, 'branchId': 1}),
+        ('user.profile', 'GET', '/api/user/profile', None),
+        ('user.list', 'GET', '/api/users', None),
+        ('area.list', 'GET', '/api/areas', None),
+        ('role.list', 'GET', '/api/roles', None),
+        ('status.list', 'GET', '/api/status', None),
+        ('source.types', 'GET', '/api/source-types', None),
+        ('source.names', 'GET', '/api/source-names', None),
+        ('source.create', 'POST', '/api/source-names', lambda i: {
+            'branchId': 1, 'sourceTypeId': 1, 'sourceName': f'Bench {i}'}),
+        ('source_name.create', 'POST', '/api/source-name', lambda i: {'sourceName': f'Bench {i}', 'sourceTypeId': 1}),
+        ('branch.list', 'GET', '/api/branches', None),
+        ('branch.details', 'GET', lambda i: f'/api/branch/{i % 9 + 1}/details', None),
+        ('branch.create', 'POST', '/api/branches', lambda i: {'areaId': 1, 'branchName': f'Bench {i}'}),
+        ('branch.full_create', 'POST', '/api/branch/full-create', lambda i: {
+            'areaId': 1, 'branchName': f'Bench Full {i}', 'sourceTypes': [
+                {'id': 1, 'sourceNames': [f'A{i}-{n}' for n in range(5)]},
+                {'id': 2, 'sourceNames': [f'B{i}-{n}' for n in range(5)]}]}),
+        ('branch_source.create', 'POST', '/branch-source', lambda i: {'branchId': i % 9 + 1, 'sourceTypeId': 1}),
+        ('branch_source_name.list', 'GET', lambda i: f'/api/branch/{i % 9 + 1}/source-names', None),
+        ('branch_source_name.create', 'POST', '/api/branch-source-name', lambda i: {
+            'branchId': i % 9 + 1, 'sourceNameId': 1}),
+        ('daily.page', 'GET', '/api/daily?limit=100', None),
+        ('daily.branch_range', 'GET', lambda i: f'/api/daily?branchId={i % 9 + 1}&dateFrom={month_ago}', None),
+        ('daily.stream', 'GET', lambda i: f'/api/daily?stream=1&branchId={i % 9 + 1}&dateFrom={month_ago}', None),
+        ('daily.batch', 'POST', '/api/daily/batch', lambda i: {'readings': [{
+            'branchId': 1, 'sourceType': 'Bench', 'sourceName': f'B{i}-{n}',
+            'date': (today - timedelta(days=n)).isoformat(), 'productionVolume': 100,
+            'electricityConsumption': 50} for n in range(50)]}),
+        ('monthly.list', 'GET', lambda i: f'/api/monthly?branchId={i % 9 + 1}', None),
+        ('dashboard.stats', 'GET', '/api/dashboard-stats', None),
+        ('analytics.rollup', 'GET', '/api/analytics/daily-rollup?groupBy=area,month', None),
+        ('analytics.energy', 'GET', lambda i: f'/api/analytics/energy-intensity?branchId={i % 9 + 1}', None),
+        ('export.daily', 'GET', lambda i: f'/api/export/daily?branchId={i % 9 + 1}&dateFrom={month_ago}', None),
+        ('export.monthly', 'GET', '/api/export/monthly', None),
+        ('hierarchy', 'GET', '/api/hierarchy', None),
+        ('metrics', 'GET', '/api/metrics', None),
+    ]
+
+
+def summarize(samples, elapsed):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return {'n': len(samples), 'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99),
+            'throughput': len(samples) / elapsed if elapsed else 0.0}
+
+
+def run_scale(scale, args):
+    # Seeded data is cached per scale; each run writes to a scratch copy of it
+    cached = os.path.join(args.data_dir, f'mis_bench_{scale}.db')
+    database = os.path.join(tempfile.mkdtemp(), 'mis_bench.db')
+    seeded = os.path.exists(cached)
+    if seeded:
+        shutil.copyfile(cached, database)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + database
+    os.environ.setdefault('BCRYPT_ROUNDS', '4')  # keep login from dominating every other route
+    from app import create_app
+    from benchmarks.seed import seed
+    from models import db
+
+    app = create_app()
+
+    if not seeded:
+        with app.app_context():
+            seed(*SCALES[scale])
+            db.session.remove()
+            db.engine.dispose()
+        shutil.copyfile(database, cached)
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'user0', 'password': 'secret'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    results = {}
+    for name, method, path, body in scenarios():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        calls = count()
+
+        def call(_):
+            i = next(calls)
+            url = path(i) if callable(path) else path
+            start = time.perf_counter()
+            response = app.test_client().open(url, method=method, headers=headers,
+                                              json=body(i) if body else None)
+            response.get_data()  # drain streamed bodies so the full cost is measured
+            return time.perf_counter() - start, response.status_code
+
+        for i in range(args.warmup):
+            call(i)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            outcomes = list(pool.map(call, range(args.requests)))
+        elapsed = time.perf_counter() - started
+        stats = summarize([latency for latency, _ in outcomes], elapsed)
+        stats['errors'] = sum(1 for _, code in outcomes if code >= 400)
+        results[name] = stats
+    with app.app_context():
+        db.session.remove()
+    return results
+
+
+def report(results, baseline):
+    for scale, routes in results.items():
+        print(f'\n== {scale} ==')
+        print(f'{"route":<28}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"req/s":>9}{"errors":>8}{"p95 vs base":>13}')
+        for name, stats in routes.items():
+            previous = baseline.get(scale, {}).get(name)
+            change = f'{(stats["p95"] / previous["p95"] - 1) * 100:+.0f}%' if previous and previous['p95'] else ''
+            print(f'{name:<28}{stats["p50"]:>9.1f}{stats["p95"]:>9.1f}{stats["p99"]:>9.1f}'
+                  f'{stats["throughput"]:>9.1f}{stats["errors"]:>8}{change:>13}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', choices=sorted(SCALES), default=['small'])
+    parser.add_argument('--requests', type=int, default=100, help='requests per route')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--only', nargs='+', help='route name prefixes, e.g. daily analytics')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'mis_bench'))
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='compare p95 against a previous --output file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    if args.worker:
+        print(json.dumps(run_scale(args.worker, args)))
+        return
+
+    results = {}
+    for scale in args.scales:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', scale, '--data-dir', args.data_dir,
+                   '--requests', str(args.requests), '--warmup', str(args.warmup), '--threads', str(args.threads)]
+        if args.only:
+            command += ['--only', *args.only]
+        output = subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.PIPE, text=True).stdout
+        results[scale] = json.loads(output.strip().splitlines()[-1])
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Synthetic MIS dataset generator.
+
+Fills an empty database (tables created with db.create_all) with areas,
+branches, source types, sources per branch, users, and `years` of Daily
+and Monthly history ending today. Output is deterministic for a given
+--seed so benchmark runs are comparable.
+
+    DATABASE_URL=sqlite:////tmp/mis_bench.db python benchmarks/seed.py --years 2
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SOURCE_TYPES = [
+    'Deep Well - Electric', 'Deep Well - Genset Operated', 'Shallow Well', 'Spring - Gravity',
+    'Spring - Power-driven', 'Bulk', 'WTP', 'Booster'
+]
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+INSERT_BATCH = 5000
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), INSERT_BATCH):
+        db.session.execute(model.__table__.insert(), rows[start:start + INSERT_BATCH])
+
+
+def seed(areas=3, branches_per_area=3, source_types=8, sources_per_branch=10, years=1,
+         users=50, password='secret', seed_value=42):
+    from models import db, Area, Branch, Role, Status, SourceType, SourceName, \
+        BranchSource, BranchSourceName, User, Daily, Monthly
+    from utils.passwords import password_hasher
+
+    rng = random.Random(seed_value)
+    db.create_all()
+    _insert(db, Role, [{'roleName': name, 'description': name} for name in
+                       ('Super Admin', 'Central Admin', 'Branch Admin', 'Encoder')])
+    _insert(db, Status, [{'statusName': name} for name in ('Accepted', 'Pending', 'Rejected')])
+    _insert(db, Area, [{'areaCode': i + 1, 'areaName': f'Area {i + 1}', 'isActive': True}
+                       for i in range(areas)])
+    _insert(db, SourceType, [{'sourceType': SOURCE_TYPES[i % len(SOURCE_TYPES)], 'isActive': True}
+                             for i in range(source_types)])
+
+    branches = []
+    for area_id in range(1, areas + 1):
+        for _ in range(branches_per_area):
+            branches.append({'id': len(branches) + 1, 'areaId': area_id, 'branchCode': 100 + len(branches),
+                             'branchName': f'Branch {len(branches) + 1}', 'isActive': True})
+    _insert(db, Branch, branches)
+
+    source_names, branch_sources, branch_source_names, sources = [], [], [], []
+    for branch in branches:
+        type_ids = sorted(rng.sample(range(1, source_types + 1), min(source_types, 3)))
+        for type_id in type_ids:
+            branch_sources.append({'branchId': branch['id'], 'sourceTypeId': type_id,
+                                   'areaId': branch['areaId'], 'isActive': True})
+        for n in range(sources_per_branch):
+            type_id = type_ids[n % len(type_ids)]
+            source_id = len(source_names) + 1
+            source_names.append({'id': source_id, 'branchId': branch['id'], 'sourceTypeId': type_id,
+                                 'sourceName': f'P{n + 1}', 'isActive': True})
+            branch_source_names.append({'branchId': branch['id'], 'sourceNameId': source_id,
+                                        'areaId': branch['areaId'], 'isActive': True})
+            sources.append((branch, SOURCE_TYPES[(type_id - 1) % len(SOURCE_TYPES)], f'P{n + 1}', type_id))
+    _insert(db, SourceName, source_names)
+    _insert(db, BranchSource, branch_sources)
+    _insert(db, BranchSourceName, branch_source_names)
+
+    password_hash = password_hasher.hash(password)
+    _insert(db, User, [{
+        'roleId': 1 + i % 4, 'areaId': branches[i % len(branches)]['areaId'],
+        'branchId': branches[i % len(branches)]['id'], 'userName': f'user{i}', 'userNameKey': f'user{i}',
+        'firstName': 'Bench', 'lastName': f'User {i}', 'email': f'user{i}@example.com',
+        'passwordHash': password_hash, 'isActive': True
+    } for i in range(users)])
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=365 * years)
+    days = (today - start).days
+    statuses = [1] * 7 + [2] * 2 + [3]  # Status ids: Accepted, Pending, Rejected
+    daily = []
+    for branch, type_name, source_name, _ in sources:
+        base_volume = rng.uniform(200, 2000)
+        intensity = rng.uniform(0.3, 0.9)
+        for day in range(days):
+            volume = base_volume * rng.uniform(0.8, 1.2)
+            daily.append({
+                'branchId': branch['id'], 'areaId': branch['areaId'], 'sourceType': type_name,
+                'sourceName': source_name, 'status': rng.choice(statuses), 'byUser': 1,
+                'date': start + timedelta(days=day), 'productionVolume': volume,
+                'operationHours': rng.uniform(12, 24), 'serviceInterruption': False,
+                'totalHoursServiceInterruption': 0.0,
+                'electricityConsumption': volume * intensity * rng.uniform(0.9, 1.1),
+                'VFDFrequency': 60.0, 'spotFlow': rng.uniform(5, 50), 'spotPressure': rng.uniform(20, 80),
+                'lineVoltage1': 230.0, 'lineVoltage2': 230.0, 'lineVoltage3': 230.0,
+                'lineCurrent1': 10.0, 'lineCurrent2': 10.0, 'lineCurrent3': 10.0,
+                'comment': None, 'isActive': True
+            })
+            if len(daily) >= INSERT_BATCH:
+                _insert(db, Daily, daily)
+                daily = []
+    _insert(db, Daily, daily)
+
+    monthly = []
+    for branch, _, _, type_id in sources:
+        for offset in range(12 * years):
+            month_index = (start.month - 1 + offset) % 12
+            monthly.append({
+                'branchId': branch['id'], 'sourceType': type_id, 'sourceName': 1, 'status': rng.choice([1, 1, 2, 3]),
+                'byUser': 1, 'month': MONTHS[month_index], 'year': start.year + (start.month - 1 + offset) // 12,
+                'electricityConsumption': rng.uniform(1000, 5000), 'electricityCost': rng.uniform(10000, 50000),
+                'disinfectionMode': 'Chlorine', 'isActive': True
+            })
+    _insert(db, Monthly, monthly)
+    db.session.commit()
+    return {'branches': len(branches), 'sources': len(sources), 'daily': len(sources) * days,
+            'monthly': len(monthly), 'users': users}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--areas', type=int, default=3)
+    parser.add_argument('--branches-per-area', type=int, default=3)
+    parser.add_argument('--source-types', type=int, default=8)
+    parser.add_argument('--sources-per-branch', type=int, default=10)
+    parser.add_argument('--years', type=int, default=1)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        counts = seed(args.areas, args.branches_per_area, args.source_types, args.sources_per_branch,
+                      args.years, args.users, seed_value=args.seed)
+    print(', '.join(f'{key}={value}' for key, value in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+"""baseline: schema created by MISDB.sql and MISUPDATED.sql
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing databases already have this schema: run `flask db stamp 0001` once
+    pass
+
+
+def downgrade():
+    pass
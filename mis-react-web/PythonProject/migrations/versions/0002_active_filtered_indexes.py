@@ -0,0 +1,37 @@
+"""filtered indexes on isActive = 1 for the hot lookup paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+ACTIVE_INDEXES = [
+    ('IX_User_userName_active', 'User', ['userName']),
+    ('IX_Daily_branchId_date_active', 'Daily', ['branchId', 'date']),
+    ('IX_branchSourceName_branchId_sourceNameId_areaId_active', 'branchSourceName',
+     ['branchId', 'sourceNameId', 'areaId']),
+    ('IX_sourceName_sourceTypeId_active', 'sourceName', ['sourceTypeId']),
+    ('IX_Monthly_branchId_year_month_active', 'Monthly', ['branchId', 'year', 'month']),
+]
+
+
+def upgrade():
+    for name, table, columns in ACTIVE_INDEXES:
+        op.create_index(name, table, columns,
+                        mssql_where=sa.text('isActive = 1'),
+                        sqlite_where=sa.text('isActive = 1'))
+
+
+def downgrade():
+    for name, table, columns in reversed(ACTIVE_INDEXES):
+        op.drop_index(name, table_name=table)
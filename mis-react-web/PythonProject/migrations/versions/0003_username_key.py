@@ -0,0 +1,30 @@
+"""normalized, indexed username key for login lookups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('User', sa.Column('userNameKey', sa.String(64)))
+    user = sa.table('User', sa.column('userName'), sa.column('userNameKey'))
+    op.execute(user.update().values(
+        userNameKey=sa.func.lower(sa.func.ltrim(sa.func.rtrim(user.c.userName)))
+    ))
+    op.create_index('IX_User_userNameKey', 'User', ['userNameKey'])
+
+
+def downgrade():
+    op.drop_index('IX_User_userNameKey', table_name='User')
+    op.drop_column('User', 'userNameKey')
@@ -0,0 +1,35 @@
+"""updatedAt change stamps for ?since= delta sync
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ['Daily', 'Monthly', 'Branch', 'sourceName', 'User']
+
+
+def upgrade():
+    # The app stamps rows in UTC; GETDATE() on SQL Server would be server-local time
+    now = sa.func.getutcdate() if op.get_bind().dialect.name == 'mssql' else sa.func.current_timestamp()
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('updatedAt', sa.DateTime()))
+        # Existing rows count as changed now; clients start from a full listing anyway
+        rows = sa.table(table, sa.column('updatedAt'))
+        op.execute(rows.update().values(updatedAt=now))
+        op.create_index(f'IX_{table}_updatedAt', table, ['updatedAt'])
+
+
+def downgrade():
+    for table in reversed(SYNCED_TABLES):
+        op.drop_index(f'IX_{table}_updatedAt', table_name=table)
+        op.drop_column(table, 'updatedAt')
@@ -0,0 +1,42 @@
+"""Job table for background reports
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'Job',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('kind', sa.String(64), nullable=False),
+        sa.Column('params', sa.String(1024)),
+        sa.Column('status', sa.String(16), nullable=False),
+        sa.Column('progress', sa.Float()),
+        sa.Column('message', sa.String(512)),
+        sa.Column('byUser', sa.Integer(), sa.ForeignKey('User.id')),
+        sa.Column('createdAt', sa.DateTime()),
+        sa.Column('startedAt', sa.DateTime()),
+        sa.Column('finishedAt', sa.DateTime()),
+        sa.Column('heartbeatAt', sa.DateTime()),
+        sa.Column('resultName', sa.String(128)),
+        sa.Column('resultType', sa.String(64)),
+        sa.Column('resultSize', sa.BigInteger()),
+    )
+    op.create_index('IX_Job_byUser_kind_status', 'Job', ['byUser', 'kind', 'status'])
+
+
+def downgrade():
+    op.drop_index('IX_Job_byUser_kind_status', table_name='Job')
+    op.drop_table('Job')
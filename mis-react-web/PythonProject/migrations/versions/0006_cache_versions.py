@@ -0,0 +1,28 @@
+"""CacheVersion table shared by the response caches of all workers
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'CacheVersion',
+        sa.Column('name', sa.String(128), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('CacheVersion')
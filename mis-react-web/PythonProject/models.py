@@ -1,9 +1,44 @@
-from flask_sqlalchemy import SQLAlchemy
+import json
+from datetime import datetime
+from sqlalchemy import true
+from sqlalchemy.orm import validates
+from utils.database import RoutingSQLAlchemy
+from utils.serializers import serializer
 
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
+
+def active_index(name, *columns):
+    # Filtered index over active rows only; matched by queries filtering with active()
+    return db.Index(name, *columns,
+                    mssql_where=db.text('isActive = 1'),
+                    sqlite_where=db.text('isActive = 1'))
+
+def normalize_username(value):
+    return value.strip().lower() if value else value
+
+def active(model):
+    # Literal "isActive = 1" (not a bound parameter) so SQL Server can match filtered indexes
+    return model.isActive == true()
+
+def updated_at():
+    # Change stamp for ?since= delta sync; set by every ORM and Core insert/update
+    return db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Serializable:
+    # to_dict() over every mapped column, generated once per model (utils/serializers).
+    # updatedAt is the server's change stamp for ?since=; clients sync with X-Sync-Token.
+    __serialize_exclude__ = ('updatedAt',)
+
+    def to_dict(self):
+        return serializer(type(self))(self)
 
 class User(db.Model):
     __tablename__ = 'User'
+    __table_args__ = (
+        active_index('IX_User_userName_active', 'userName'),
+        db.Index('IX_User_userNameKey', 'userNameKey'),
+        db.Index('IX_User_updatedAt', 'updatedAt'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     roleId = db.Column(db.Integer, db.ForeignKey('Role.id'))
@@ -12,26 +47,52 @@ class User(db.Model):
     monthlyEncoded = db.Column(db.Integer)
     dailyEncoded = db.Column(db.Integer)
     userName = db.Column(db.String(64))
+    userNameKey = db.Column(db.String(64))  # normalize_username(userName), indexed for login
     firstName = db.Column(db.String(64))
     lastName = db.Column(db.String(64))
     email = db.Column(db.String(64))
     passwordHash = db.Column(db.String(64))
     isActive = db.Column(db.Boolean)
+    updatedAt = updated_at()
 
-    def to_dict(self):
-        # Import here to avoid circular imports
-        from models import Role, Area, Branch
-        role = Role.query.get(self.roleId)
-        area = Area.query.get(self.areaId)
-        branch = Branch.query.get(self.branchId)
+    @validates('userName')
+    def _sync_username_key(self, key, value):
+        self.userNameKey = normalize_username(value)
+        return value
+
+    @classmethod
+    def directory_query(cls):
+        # Users with their role/area/branch names in one joined query (no per-user lookups)
+        return (
+            db.session.query(cls, Role.roleName, Area.areaName, Branch.branchName)
+            .outerjoin(Role, Role.id == cls.roleId)
+            .outerjoin(Area, Area.id == cls.areaId)
+            .outerjoin(Branch, Branch.id == cls.branchId)
+        )
+
+    @classmethod
+    def directory(cls, *criterion):
+        rows = cls.directory_query().filter(*criterion).all()
+        return [user.to_dict(names) for user, *names in rows]
+
+    def lookup_names(self):
+        # Single round trip for the three display names of an already loaded user
+        return db.session.query(
+            db.select([Role.roleName]).where(Role.id == self.roleId).as_scalar(),
+            db.select([Area.areaName]).where(Area.id == self.areaId).as_scalar(),
+            db.select([Branch.branchName]).where(Branch.id == self.branchId).as_scalar()
+        ).one()
+
+    def to_dict(self, names=None):
+        role_name, area_name, branch_name = names if names is not None else self.lookup_names()
         return {
             'id': self.id,
             'roleId': self.roleId,
-            'roleName': role.roleName if role else None,
+            'roleName': role_name,
             'areaId': self.areaId,
-            'areaName': area.areaName if area else None,
+            'areaName': area_name,
             'branchId': self.branchId,
-            'branchName': branch.branchName if branch else None,
+            'branchName': branch_name,
             'firstName': self.firstName,
             'lastName': self.lastName,
             'email': self.email,
@@ -41,14 +102,14 @@ class User(db.Model):
             'dailyEncoded': self.dailyEncoded
         }
 
-class Role(db.Model):
+class Role(Serializable, db.Model):
     __tablename__ = 'Role'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     roleName = db.Column(db.String(64))
     description = db.Column(db.String(256))
 
-class Area(db.Model):
+class Area(Serializable, db.Model):
     __tablename__ = 'Area'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -56,23 +117,37 @@ class Area(db.Model):
     areaName = db.Column(db.String(64))
     isActive = db.Column(db.Boolean)
 
-class Branch(db.Model):
+class Branch(Serializable, db.Model):
     __tablename__ = 'Branch'
+    __table_args__ = (
+        db.Index('IX_Branch_updatedAt', 'updatedAt'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     areaId = db.Column(db.Integer, db.ForeignKey('Area.id'))
     branchCode = db.Column(db.Integer)
     branchName = db.Column(db.String(64))
     isActive = db.Column(db.Boolean)
+    updatedAt = updated_at()
 
-class Daily(db.Model):
+class Daily(Serializable, db.Model):
     __tablename__ = 'Daily'
+    # Keyset pagination walks (date, id); the branch/area variants serve the filtered listings
+    __table_args__ = (
+        db.Index('IX_Daily_date_id', 'date', 'id'),
+        db.Index('IX_Daily_branchId_date_id', 'branchId', 'date', 'id'),
+        db.Index('IX_Daily_areaId_date_id', 'areaId', 'date', 'id'),
+        active_index('IX_Daily_branchId_date_active', 'branchId', 'date'),
+        db.Index('IX_Daily_updatedAt', 'updatedAt'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     monthlyId = db.Column(db.Integer, db.ForeignKey('Monthly.id'))
+    branchId = db.Column(db.Integer, db.ForeignKey('Branch.id'))
+    areaId = db.Column(db.Integer, db.ForeignKey('Area.id'))
     sourceType = db.Column(db.String(64))
     sourceName = db.Column(db.String(64))
-    status = db.Column(db.String(32))
+    status = db.Column(db.Integer, db.ForeignKey('Status.id'))
     byUser = db.Column(db.Integer, db.ForeignKey('User.id'))
     date = db.Column(db.DateTime)
     productionVolume = db.Column(db.Float)
@@ -92,9 +167,14 @@ class Daily(db.Model):
     lineCurrent3 = db.Column(db.Float)
     comment = db.Column(db.String(512))
     isActive = db.Column(db.Boolean)
+    updatedAt = updated_at()
 
-class Monthly(db.Model):
+class Monthly(Serializable, db.Model):
     __tablename__ = 'Monthly'
+    __table_args__ = (
+        active_index('IX_Monthly_branchId_year_month_active', 'branchId', 'year', 'month'),
+        db.Index('IX_Monthly_updatedAt', 'updatedAt'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     branchId = db.Column(db.Integer, db.ForeignKey('Branch.id'))
@@ -124,8 +204,9 @@ class Monthly(db.Model):
     gensetFuelCost = db.Column(db.Float)
     isActive = db.Column(db.Boolean)
     comment = db.Column(db.String(1024))
+    updatedAt = updated_at()
 
-class SourceType(db.Model):
+class SourceType(Serializable, db.Model):
     __tablename__ = 'sourceType'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -133,44 +214,26 @@ class SourceType(db.Model):
     sourceType = db.Column(db.String(64))
     isActive = db.Column(db.Boolean)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'branchId': self.branchId,
-            'sourceType': self.sourceType,
-            'isActive': self.isActive
-        }
-
-class SourceName(db.Model):
+class SourceName(Serializable, db.Model):
     __tablename__ = 'sourceName'
+    __table_args__ = (
+        active_index('IX_sourceName_sourceTypeId_active', 'sourceTypeId'),
+        db.Index('IX_sourceName_updatedAt', 'updatedAt'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     branchId = db.Column(db.Integer, db.ForeignKey('Branch.id'))
     sourceTypeId = db.Column(db.Integer, db.ForeignKey('sourceType.id'))
     sourceName = db.Column(db.String(64))
     isActive = db.Column(db.Boolean)
+    updatedAt = updated_at()
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'branchId': self.branchId,
-            'sourceTypeId': self.sourceTypeId,
-            'sourceName': self.sourceName,
-            'isActive': self.isActive
-        }
-
-class Status(db.Model):
+class Status(Serializable, db.Model):
     __tablename__ = 'Status'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     statusName = db.Column(db.String(16))
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'statusName': self.statusName
-        }
-
 
 class BranchSource(db.Model):
     __tablename__ = 'branchSource'
@@ -197,6 +260,10 @@ class BranchSource(db.Model):
 
 class BranchSourceName(db.Model):
     __tablename__ = 'branchSourceName'
+    __table_args__ = (
+        active_index('IX_branchSourceName_branchId_sourceNameId_areaId_active',
+                     'branchId', 'sourceNameId', 'areaId'),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     branchId = db.Column(db.Integer, db.ForeignKey('Branch.id'))
     sourceNameId = db.Column(db.Integer, db.ForeignKey('sourceName.id'))
@@ -216,4 +283,49 @@ class BranchSourceName(db.Model):
             'sourceName': self.source_name.sourceName if self.source_name else None,
             'areaId': self.areaId,
             'areaName': self.area.areaName if self.area else None
-        }
\ No newline at end of file
+        }
+
+class CacheVersion(db.Model):
+    __tablename__ = 'CacheVersion'
+    # Version of each cached table (or branch), shared by every worker process; bumped
+    # after a write commits so any worker's cached body is rebuilt on its next request
+
+    name = db.Column(db.String(128), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+class Job(db.Model):
+    __tablename__ = 'Job'
+    # Duplicate-submission check and per-user listing
+    __table_args__ = (
+        db.Index('IX_Job_byUser_kind_status', 'byUser', 'kind', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(64), nullable=False)
+    params = db.Column(db.String(1024))  # JSON object as submitted, keys sorted
+    status = db.Column(db.String(16), nullable=False, default='queued')  # queued, running, succeeded, failed
+    progress = db.Column(db.Float, default=0.0)
+    message = db.Column(db.String(512))
+    byUser = db.Column(db.Integer, db.ForeignKey('User.id'))
+    createdAt = db.Column(db.DateTime, default=datetime.utcnow)
+    startedAt = db.Column(db.DateTime)
+    finishedAt = db.Column(db.DateTime)
+    heartbeatAt = db.Column(db.DateTime, default=datetime.utcnow)  # last progress report
+    resultName = db.Column(db.String(128))
+    resultType = db.Column(db.String(64))
+    resultSize = db.Column(db.BigInteger)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': json.loads(self.params) if self.params else {},
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'createdAt': self.createdAt,
+            'startedAt': self.startedAt,
+            'finishedAt': self.finishedAt,
+            'resultName': self.resultName,
+            'resultSize': self.resultSize,
+        }
@@ -0,0 +1,87 @@
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func
+from models import db, Daily, Area, Branch
+from routes.daily_routes import daily_filters
+from utils.auth import token_required  # Adjust the import path if needed
+from utils.jobs import job_kind
+from utils.periods import PERIODS, period_expression, format_period
+
+analytics_bp = Blueprint('analytics', __name__)
+
+ROLLUP_MEASURES = (
+    'productionVolume', 'operationHours',
+    'electricityConsumption', 'totalHoursServiceInterruption'
+)
+
+def rollup_dimensions(names):
+    # groupBy names -> [(output key, SQL expression)], plus joins the names need
+    dimensions = []
+    joins = set()
+    for name in names:
+        if name == 'area':
+            dimensions += [('areaId', Daily.areaId), ('areaName', Area.areaName)]
+            joins.add('area')
+        elif name == 'branch':
+            dimensions += [('branchId', Daily.branchId), ('branchName', Branch.branchName)]
+            joins.add('branch')
+        elif name == 'sourceType':
+            dimensions.append(('sourceType', Daily.sourceType))
+        elif name == 'sourceName':
+            dimensions.append(('sourceName', Daily.sourceName))
+        elif name in PERIODS:
+            dimensions.append(('period', period_expression(Daily.date, name)))
+        else:
+            raise ValueError(f'Unknown groupBy dimension: {name}')
+    if len([name for name in names if name in PERIODS]) > 1:
+        raise ValueError('Group by at most one of day, week, month')
+    return dimensions, joins
+
+def parse_rollup(args):
+    # Query string (or job parameters) -> (groupBy, measures, dimensions, joins, criteria)
+    group_by = [name for name in args.get('groupBy', 'month').split(',') if name]
+    measures = [name for name in args.get('measures', ','.join(ROLLUP_MEASURES)).split(',') if name]
+    unknown = [name for name in measures if name not in ROLLUP_MEASURES]
+    if unknown:
+        raise ValueError(f'Unknown measures: {", ".join(unknown)}')
+    dimensions, joins = rollup_dimensions(group_by)
+    return group_by, measures, dimensions, joins, daily_filters(args)
+
+def daily_rollup_report(group_by, measures, dimensions, joins, criteria):
+    keys = [dimension[0] for dimension in dimensions]
+    group_columns = [dimension[1] for dimension in dimensions]
+    aggregates = [func.sum(getattr(Daily, name)) for name in measures]
+    query = db.session.query(*group_columns, func.count(Daily.id), *aggregates).select_from(Daily)
+    if 'area' in joins:
+        query = query.outerjoin(Area, Area.id == Daily.areaId)
+    if 'branch' in joins:
+        query = query.outerjoin(Branch, Branch.id == Daily.branchId)
+    query = (
+        query.filter(*criteria)
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+
+    rows = []
+    for row in query.all():
+        item = dict(zip(keys, row[:len(keys)]))
+        if 'period' in item:
+            item['period'] = format_period(item['period'])
+        item['readings'] = row[len(keys)]
+        item.update(zip(measures, row[len(keys) + 1:]))
+        rows.append(item)
+    return {'groupBy': group_by, 'measures': measures, 'rows': rows}
+
+@analytics_bp.route('/api/analytics/daily-rollup', methods=['GET'])
+@token_required
+def daily_rollup(current_user):
+    try:
+        rollup = parse_rollup(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify(daily_rollup_report(*rollup))
+
+@job_kind('daily-rollup')
+def daily_rollup_job(params):
+    # Year-long or all-branch rollups: POST /api/jobs/daily-rollup, result is the same JSON body
+    rollup = parse_rollup(params)
+    return lambda job: job.write_json(daily_rollup_report(*rollup), 'daily-rollup.json')
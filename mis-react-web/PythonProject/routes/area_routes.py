@@ -1,21 +1,17 @@
 from flask import Blueprint, jsonify, current_app
 from models import Area
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.reference_cache import reference_data
 
 area_bp = Blueprint('area', __name__)
 
 @area_bp.route('/api/areas', methods=['GET'])
 @token_required
+@reference_data(Area)
 def get_all_areas(current_user):
     try:
         areas = Area.query.filter_by(isActive=True).all()
-        area_list = [{
-            'id': area.id,
-            'areaCode': area.areaCode,
-            'areaName': area.areaName,
-            'isActive': area.isActive
-        } for area in areas]
-        return jsonify(area_list)
+        return jsonify([area.to_dict() for area in areas])
     except Exception as e:
         return jsonify({'message': f'Failed to get areas: {str(e)}'}), 500
 
@@ -27,12 +23,7 @@ def test_areas():
             return jsonify({
                 'status': 'success',
                 'message': 'Successfully found an area',
-                'area': {
-                    'id': area.id,
-                    'areaCode': area.areaCode,
-                    'areaName': area.areaName,
-                    'isActive': area.isActive
-                }
+                'area': area.to_dict()
             })
         else:
             return jsonify({
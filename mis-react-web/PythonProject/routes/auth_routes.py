@@ -1,51 +1,64 @@
 from flask import Blueprint, request, jsonify, current_app
-from models import db, User
+from models import db, User, normalize_username
+from utils.passwords import password_hasher, PasswordPoolBusy
+from utils.logging_setup import Payload
 import jwt
 from datetime import datetime, timedelta
 
 auth_bp = Blueprint('auth', __name__)
 
+def login_query(username):
+    # Case-insensitive username search as an equality seek on the normalized key
+    return User.directory_query().filter(User.userNameKey == normalize_username(username))
+
 @auth_bp.route('/api/auth/login', methods=['POST'])
 def login():
-    print("\n=== Login Attempt ===")  # Debug log
     try:
         data = request.get_json()
-        print(f"Received login request data: {data}")  # Debug log
+        current_app.logger.debug('Login attempt for %s', (data or {}).get('username'))
 
         if not data or not data.get('username') or not data.get('password'):
-            print("Missing username or password")  # Debug log
+            current_app.logger.info('Login rejected: missing username or password')
             return jsonify({'message': 'Missing username or password'}), 400
 
-        # Case-insensitive username search
-        user = User.query.filter(User.userName.ilike(data['username'])).first()
-        print(f"Found user: {user.userName if user else 'None'}")  # Debug log
+        row = login_query(data['username']).first()
+        user, names = (row[0], row[1:]) if row else (None, None)
 
-        if not user or not user.passwordHash == data['password']:  # In production, use proper password hashing!
-            print("Invalid credentials")  # Debug log
+        try:
+            valid, new_hash = password_hasher.verify(data['password'], user.passwordHash if user else None)
+        except PasswordPoolBusy:
+            return jsonify({'message': 'Login service is busy, please retry'}), 503
+        if not user or not valid:
+            current_app.logger.info('Login failed for %s: invalid credentials', data['username'])
             return jsonify({'message': 'Invalid username or password'}), 401
-
         if not user.isActive:
-            print("Account inactive")  # Debug log
+            current_app.logger.info('Login failed for %s: account inactive', data['username'])
             return jsonify({'message': 'Account is inactive'}), 401
 
+        if new_hash:
+            # Legacy plaintext or outdated cost factor: store a current bcrypt hash
+            user.passwordHash = new_hash
+            db.session.commit()
+
         token = jwt.encode({
             'user_id': user.id,
             'exp': datetime.utcnow() + timedelta(hours=1)
         }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
 
-        print("Login successful!")  # Debug log
+        current_app.logger.info('Login succeeded for user %s', user.id)
         return jsonify({
             'token': token,
-            'user': user.to_dict()
+            'user': user.to_dict(names)
         })
     except Exception as e:
-        print(f"Login error: {str(e)}")  # Debug log
+        current_app.logger.exception('Login error')
         return jsonify({'message': f'Login failed: {str(e)}'}), 500
 
 @auth_bp.route('/api/auth/register', methods=['POST'])
 def register():
     data = request.get_json()
-    print("Received registration data:", data)  # For debugging
+    current_app.logger.debug('Registration data: %s', Payload(
+        {key: value for key, value in (data or {}).items() if key != 'password'}))
 
     required_fields = ['userName', 'firstName', 'lastName', 'email', 'password', 'roleId']
     for field in required_fields:
@@ -59,17 +72,22 @@ def register():
     if branch_id in [None, '', 'null', 0, '0']:
         branch_id = None
 
-    if User.query.filter_by(userName=data['userName']).first():
+    if User.query.filter_by(userNameKey=normalize_username(data['userName'])).first():
         return jsonify({'message': 'Username already exists'}), 400
     if User.query.filter_by(email=data['email']).first():
         return jsonify({'message': 'Email already exists'}), 400
 
+    try:
+        password_hash = password_hasher.hash(data['password'])
+    except PasswordPoolBusy:
+        return jsonify({'message': 'Registration service is busy, please retry'}), 503
+
     new_user = User(
         userName=data['userName'],
         firstName=data['firstName'],
         lastName=data['lastName'],
         email=data['email'],
-        passwordHash=data['password'],  # In production, hash the password!
+        passwordHash=password_hash,
         roleId=data['roleId'],
         areaId=area_id,
         branchId=branch_id,
@@ -83,5 +101,5 @@ def register():
         return jsonify({'message': 'User created successfully', 'user': new_user.to_dict()}), 201
     except Exception as e:
         db.session.rollback()
-        print(f"Error creating user: {str(e)}")
+        current_app.logger.exception('Error creating user')
         return jsonify({'message': f'Failed to create user: {str(e)}'}), 500
\ No newline at end of file
@@ -1,21 +1,27 @@
 from flask import Blueprint, request, jsonify
-from models import db, Branch, BranchSource, BranchSourceName, SourceName
+from sqlalchemy.orm import selectinload
+from models import db, active, Branch, BranchSource, BranchSourceName, SourceName
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.reference_cache import reference_data, mark_changed, cached_json
+from utils.branch_cache import branch_cache, branch_version, mark_branches_changed
+from utils.sync import InvalidSyncToken, changed_since, sync_token
 
 branch_bp = Blueprint('branch', __name__)
 
+PROVISION_ID_BATCH = 1000  # branch ids per IN list (SQL Server allows 2100 parameters)
+
 @branch_bp.route('/api/branches', methods=['GET'])
 @token_required
+@sync_token
+@reference_data(Branch)
 def get_all_branches(current_user):
     try:
-        branches = Branch.query.filter_by(isActive=True).all()
-        return jsonify([{
-            'id': branch.id,
-            'areaId': branch.areaId,
-            'branchCode': branch.branchCode,
-            'branchName': branch.branchName,
-            'isActive': branch.isActive
-        } for branch in branches])
+        criteria = changed_since(Branch, request.args) or [active(Branch)]
+    except InvalidSyncToken as e:
+        return jsonify({'message': str(e)}), 400
+    try:
+        branches = Branch.query.filter(*criteria).all()
+        return jsonify([branch.to_dict() for branch in branches])
     except Exception as e:
         return jsonify({'message': f'Failed to get branches: {str(e)}'}), 500
 
@@ -31,13 +37,7 @@ def create_branch(current_user):
     )
     db.session.add(new_branch)
     db.session.commit()
-    return jsonify({
-        'id': new_branch.id,
-        'areaId': new_branch.areaId,
-        'branchCode': new_branch.branchCode,
-        'branchName': new_branch.branchName,
-        'isActive': new_branch.isActive
-    }), 201
+    return jsonify(new_branch.to_dict()), 201
 
 @branch_bp.route('/api/branch', methods=['POST'])
 def add_branch():
@@ -59,66 +59,136 @@ def add_branch():
 
     return jsonify({'branchId': branch.id}), 201
 
+def branch_details(branch_id):
+    # Three fixed queries: the branch, then its source links and source-name links,
+    # each with the linked type/name joined in
+    branch = (
+        Branch.query
+        .options(
+            selectinload(Branch.branch_sources).joinedload(BranchSource.source_type),
+            selectinload(Branch.branch_source_names).joinedload(BranchSourceName.source_name),
+        )
+        .filter(Branch.id == branch_id)
+        .first()
+    )
+    if branch is None:
+        return None
+    return {
+        'id': branch.id,
+        'areaId': branch.areaId,
+        'branchName': branch.branchName,
+        'sourceTypes': [
+            {'id': bs.sourceTypeId, 'name': bs.source_type.sourceType}
+            for bs in branch.branch_sources
+        ],
+        'sourceNames': [
+            {
+                'id': bsn.sourceNameId,
+                'name': bsn.source_name.sourceName,
+                'sourceTypeId': bsn.source_name.sourceTypeId
+            }
+            for bsn in branch.branch_source_names
+        ]
+    }
+
 @branch_bp.route('/api/branch/<int:branch_id>/details', methods=['GET'])
 def get_branch_details(branch_id):
-    branch = Branch.query.get(branch_id)
-    if not branch:
-        return jsonify({'error': 'Branch not found'}), 404
-
-    # Get source types for this branch
-    source_types = [
-        {
-            'id': bs.sourceTypeId,
-            'name': bs.source_type.sourceType
-        }
-        for bs in branch.branch_sources
-    ]
+    def build():
+        details = branch_details(branch_id)
+        if details is None:
+            return jsonify({'error': 'Branch not found'}), 404
+        return jsonify(details)
+    return cached_json(branch_cache, branch_id, branch_version(branch_id), build)
+
+def provision_error(index, spec):
+    # Message for the first problem in one branch spec, or None; checked before any insert
+    if not isinstance(spec, dict) or not spec.get('areaId') or not spec.get('branchName'):
+        return f'Branch {index} needs areaId and branchName'
+    source_types = spec.get('sourceTypes', [])
+    if not isinstance(source_types, list):
+        return f'Branch {index}: sourceTypes must be a list'
+    for st in source_types:
+        if not isinstance(st, dict) or not isinstance(st.get('id'), int) or isinstance(st.get('id'), bool):
+            return f'Branch {index}: every source type needs an integer id'
+        names = st.get('sourceNames', [])
+        if not isinstance(names, list) or not all(isinstance(sn, str) for sn in names):
+            return f'Branch {index}: sourceNames must be a list of names'
+    return None
 
-    # Get source names for this branch
-    branch_source_names = BranchSourceName.query.filter_by(branchId=branch_id).all()
-    source_names = [
-        {
-            'id': bsn.sourceNameId,
-            'name': bsn.source_name.sourceName,
-            'sourceTypeId': bsn.source_name.sourceTypeId
-        }
-        for bsn in branch_source_names
+def provision_branches(specs):
+    # Branch rows first: their identities key everything else
+    branches = [
+        Branch(areaId=spec['areaId'], branchName=spec['branchName'], isActive=True)
+        for spec in specs
     ]
+    db.session.add_all(branches)
+    db.session.flush()
 
-    return jsonify({
-        'id': branch.id,
-        'areaId': branch.areaId,
-        'branchName': branch.branchName,
-        'sourceTypes': source_types,
-        'sourceNames': source_names
-    })
+    source_links = []
+    source_names = []
+    for spec, branch in zip(specs, branches):
+        for st in spec.get('sourceTypes', []):
+            source_links.append({
+                'branchId': branch.id,
+                'sourceTypeId': st['id'],
+                'areaId': branch.areaId,
+                'isActive': True
+            })
+            source_names.extend(
+                {'branchId': branch.id, 'sourceTypeId': st['id'], 'sourceName': sn, 'isActive': True}
+                for sn in st.get('sourceNames', [])
+            )
+
+    # Source names in one executemany; every name under the new branches is one of ours,
+    # so their ids come back with a select per PROVISION_ID_BATCH branches
+    area_ids = {branch.id: branch.areaId for branch in branches}
+    name_links = []
+    if source_names:
+        db.session.execute(SourceName.__table__.insert(), source_names)
+        branch_ids = list(area_ids)
+        for start in range(0, len(branch_ids), PROVISION_ID_BATCH):
+            rows = (
+                db.session.query(SourceName.id, SourceName.branchId)
+                .filter(SourceName.branchId.in_(branch_ids[start:start + PROVISION_ID_BATCH]))
+                .all()
+            )
+            name_links.extend({
+                'branchId': branch_id,
+                'sourceNameId': name_id,
+                'areaId': area_ids[branch_id],
+                'isActive': True
+            } for name_id, branch_id in rows)
+
+    # Link rows need no identities back: one executemany each
+    db.session.bulk_insert_mappings(BranchSource, source_links)
+    db.session.bulk_insert_mappings(BranchSourceName, name_links)
+    mark_changed(db.session, SourceName, BranchSource, BranchSourceName)
+    mark_branches_changed(db.session, *(branch.id for branch in branches))
+    return branches
 
 @branch_bp.route('/api/branch/full-create', methods=['POST'])
 def full_create_branch():
     data = request.json
-    area_id = data['areaId']
-    branch_name = data['branchName']
-    source_types = data['sourceTypes']  # List of {id, sourceNames: [str, ...]}
-
-    # Create the branch
-    branch = Branch(areaId=area_id, branchName=branch_name, isActive=True)
-    db.session.add(branch)
-    db.session.commit()
+    # One branch object (the original payload), a list of them, or {"branches": [...]}
+    specs = data.get('branches', data) if isinstance(data, dict) else data
+    single = isinstance(specs, dict)
+    if single:
+        specs = [specs]
+    if not isinstance(specs, list) or not specs:
+        return jsonify({'error': 'Expected a branch or a list of branches'}), 400
+    for index, spec in enumerate(specs):
+        error = provision_error(index, spec)
+        if error:
+            return jsonify({'error': error}), 400
 
-    # For each source type, create BranchSource and SourceNames
-    for st in source_types:
-        st_id = st['id']
-        bs = BranchSource(branchId=branch.id, sourceTypeId=st_id)
-        db.session.add(bs)
+    # Everything below is one transaction: a failure leaves no half-created branch
+    try:
+        branches = provision_branches(specs)
         db.session.commit()
-        for sn in st.get('sourceNames', []):
-            # Create SourceName
-            source_name = SourceName(branchId=branch.id, sourceTypeId=st_id, sourceName=sn, isActive=True)
-            db.session.add(source_name)
-            db.session.commit()
-            # Link in BranchSourceName
-            bsn = BranchSourceName(branchId=branch.id, sourceNameId=source_name.id)
-            db.session.add(bsn)
-            db.session.commit()
-
-    return jsonify({'branchId': branch.id}), 201
\ No newline at end of file
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create branch: {str(e)}'}), 500
+
+    if single:
+        return jsonify({'branchId': branches[0].id}), 201
+    return jsonify({'branchIds': [branch.id for branch in branches]}), 201
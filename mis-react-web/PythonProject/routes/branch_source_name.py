@@ -1,26 +1,31 @@
-from flask import Blueprint, jsonify, request
-from models import db, Branch, BranchSourceName, SourceName, SourceType
+from flask import Blueprint, jsonify, request, current_app
+from sqlalchemy.orm import joinedload
+from models import db, active, Branch, BranchSourceName, SourceName, SourceType
+from utils.logging_setup import Payload
 
 branch_source_name_bp = Blueprint('branch_source_name', __name__)
 
-@branch_source_name_bp.route('/api/branch/<int:branch_id>/source-names', methods=['GET'])
-def get_branch_source_names(branch_id):
-    source_type_id = request.args.get('sourceTypeId', type=int)
-    area_id = request.args.get('areaId', type=int)  # <-- get areaId from query params
-
+def branch_source_names_query(branch_id, source_type_id=None, area_id=None):
+    # Active links only, so the (branchId, sourceNameId, areaId) filtered index applies
     query = (
         db.session.query(SourceName, SourceType)
         .join(BranchSourceName, BranchSourceName.sourceNameId == SourceName.id)
         .join(SourceType, SourceName.sourceTypeId == SourceType.id)
-        .filter(BranchSourceName.branchId == branch_id)
+        .filter(BranchSourceName.branchId == branch_id, active(BranchSourceName))
     )
     if source_type_id:
         query = query.filter(SourceName.sourceTypeId == source_type_id)
     if area_id:
         query = query.filter(BranchSourceName.areaId == area_id)  # <-- filter by areaId
+    return query
+
+@branch_source_name_bp.route('/api/branch/<int:branch_id>/source-names', methods=['GET'])
+def get_branch_source_names(branch_id):
+    source_type_id = request.args.get('sourceTypeId', type=int)
+    area_id = request.args.get('areaId', type=int)  # <-- get areaId from query params
 
+    query = branch_source_names_query(branch_id, source_type_id, area_id)
     results = query.all()
-    print(f"Results for branch {branch_id}, area {area_id}: {results}")  # Debug print
     response = [
         {
             **sn.to_dict(),
@@ -28,7 +33,7 @@ def get_branch_source_names(branch_id):
         }
         for sn, st in results
     ]
-    print(f"Response: {response}")  # Debug print
+    current_app.logger.debug('Source names for branch %s, area %s: %s', branch_id, area_id, Payload(response))
     return jsonify(response)
 
 @branch_source_name_bp.route('/api/branch-source-name', methods=['POST'])
@@ -54,7 +59,13 @@ def create_branch_source_name():
         isActive=is_active
     )
     db.session.add(new_bsn)
+    db.session.flush()
+    link_id = new_bsn.id
     db.session.commit()
-    return jsonify(new_bsn.to_dict()), 201
+    # Reload with the names to_dict serializes joined in: one query instead of four
+    created = BranchSourceName.query.options(
+        joinedload(BranchSourceName.area), joinedload(BranchSourceName.branch), joinedload(BranchSourceName.source_name)
+    ).filter(BranchSourceName.id == link_id).one()
+    return jsonify(created.to_dict()), 201
 
 
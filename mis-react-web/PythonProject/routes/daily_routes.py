@@ -1,36 +1,230 @@
-from flask import Blueprint, jsonify
-from models import Daily
+from datetime import datetime
+from flask import Blueprint, jsonify, request
+from sqlalchemy import and_, or_
+from models import db, active, Daily, Branch, Status
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.pagination import page_size, encode_cursor, decode_cursor
+from utils.streaming import wants_stream, ndjson_response
+from utils.reference_cache import mark_changed
+from utils.stats import record_rows
+from utils.serializers import serializer, parse_fields, row_serializer
+from utils.sync import changed_since, sync_fields, sync_token
 
 daily_bp = Blueprint('daily', __name__)
 
+MAX_BATCH_SIZE = 5000
+DAILY_NUMERIC_FIELDS = (
+    'productionVolume', 'operationHours', 'totalHoursServiceInterruption',
+    'electricityConsumption', 'VFDFrequency', 'spotFlow', 'spotPressure',
+    'lineVoltage1', 'lineVoltage2', 'lineVoltage3',
+    'lineCurrent1', 'lineCurrent2', 'lineCurrent3'
+)
+
+daily_to_dict = serializer(Daily)
+
+def parse_date_filter(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError('Invalid date filter, expected YYYY-MM-DD')
+
+def daily_filters(args):
+    # Translate the listing query string into SQL criteria; raises ValueError with the
+    # client-facing message on bad dates, an unknown status or an invalid sync token
+    criteria = [Daily.date.isnot(None)]
+    changed = changed_since(Daily, args)
+    if changed:
+        criteria.extend(changed)  # a delta includes soft-deleted rows so clients can drop them
+    elif args.get('includeInactive') != '1':
+        criteria.append(active(Daily))
+    if args.get('dateFrom'):
+        criteria.append(Daily.date >= parse_date_filter(args['dateFrom']))
+    if args.get('dateTo'):
+        criteria.append(Daily.date <= parse_date_filter(args['dateTo']))
+    branch_id = args.get('branchId', type=int)
+    if branch_id:
+        criteria.append(Daily.branchId == branch_id)
+    area_id = args.get('areaId', type=int)
+    if area_id:
+        criteria.append(Daily.areaId == area_id)
+    if args.get('sourceName'):
+        criteria.append(Daily.sourceName == args['sourceName'])
+    if args.get('status'):
+        # Daily.status holds Status ids; the filter also accepts the status name
+        criteria.append(Daily.status == resolve_status(args['status'], status_ids()))
+    return criteria
+
 @daily_bp.route('/api/daily', methods=['GET'])
 @token_required
+@sync_token
 def get_all_daily(current_user):
-    daily_reports = Daily.query.all()
-    return jsonify([{
-        'id': report.id,
-        'monthlyId': report.monthlyId,
-        'sourceType': report.sourceType,
-        'sourceName': report.sourceName,
-        'status': report.status,
-        'byUser': report.byUser,
-        'date': report.date,
-        'productionVolume': report.productionVolume,
-        'operationHours': report.operationHours,
-        'serviceInterruption': report.serviceInterruption,
-        'totalHoursServiceInterruption': report.totalHoursServiceInterruption,
-        'electricityConsumption': report.electricityConsumption,
-        'VFDFrequency': report.VFDFrequency,
-        'spotFlow': report.spotFlow,
-        'spotPressure': report.spotPressure,
-        'timeSpotMeasurements': report.timeSpotMeasurements,
-        'lineVoltage1': report.lineVoltage1,
-        'lineVoltage2': report.lineVoltage2,
-        'lineVoltage3': report.lineVoltage3,
-        'lineCurrent1': report.lineCurrent1,
-        'lineCurrent2': report.lineCurrent2,
-        'lineCurrent3': report.lineCurrent3,
-        'comment': report.comment,
-        'isActive': report.isActive
-    } for report in daily_reports])
\ No newline at end of file
+    try:
+        criteria = daily_filters(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            last_date, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        criteria.append(or_(
+            Daily.date < last_date,
+            and_(Daily.date == last_date, Daily.id < last_id)
+        ))
+
+    try:
+        fields = parse_fields(Daily, request.args.get('fields'), sync_fields(request.args))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = Daily.query.filter(*criteria).order_by(Daily.date.desc(), Daily.id.desc())
+    serialize = daily_to_dict
+    if fields:
+        # Column-only select; the cursor keys ride along after the requested fields
+        selected = fields + tuple(key for key in ('date', 'id') if key not in fields)
+        query = query.with_entities(*(getattr(Daily, key) for key in selected))
+        serialize = row_serializer(fields)
+    if wants_stream():
+        return ndjson_response(query, serialize)
+
+    limit = page_size(request.args.get('limit'))
+    # Newest first; one extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].date, page[-1].id) if len(rows) > limit else None
+    return jsonify({
+        'items': [serialize(report) for report in page],
+        'nextCursor': next_cursor
+    })
+
+
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no', '')
+
+def parse_flag(value):
+    # Strict boolean: JSON true/false, 0/1, or the usual strings; anything else is an error
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in TRUE_VALUES + FALSE_VALUES:
+        return value.strip().lower() in TRUE_VALUES
+    raise ValueError(f'expected a boolean, got {value!r}')
+
+def status_ids():
+    # Daily.status is an INT foreign key to Status; readings may name the status instead
+    return {name.lower(): status_id for status_id, name in db.session.query(Status.id, Status.statusName)}
+
+def resolve_status(value, ids):
+    # None -> Pending; ids and names (case-insensitive) -> Status.id; raises ValueError
+    if value in (None, ''):
+        value = 'Pending'
+    if isinstance(value, bool):
+        raise ValueError(f'Unknown status: {value!r}')
+    if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+        if int(value) in ids.values():
+            return int(value)
+    elif isinstance(value, str) and value.strip().lower() in ids:
+        return ids[value.strip().lower()]
+    raise ValueError(f'Unknown status: {value}')
+
+def parse_reading(item):
+    # Normalize one submitted reading into Daily column values; raises ValueError
+    if not isinstance(item, dict):
+        raise ValueError('Reading must be an object')
+    for field in ('branchId', 'sourceType', 'sourceName', 'date'):
+        if item.get(field) in (None, ''):
+            raise ValueError(f'Missing required field: {field}')
+    try:
+        row = {
+            'branchId': int(item['branchId']),
+            'monthlyId': int(item['monthlyId']) if item.get('monthlyId') else None,
+            'sourceType': str(item['sourceType']),
+            'sourceName': str(item['sourceName']),
+            'status': item.get('status'),  # resolved to a Status id by the caller
+            'date': datetime.fromisoformat(item['date']),
+            'timeSpotMeasurements': (datetime.fromisoformat(item['timeSpotMeasurements'])
+                                     if item.get('timeSpotMeasurements') else None),
+            'serviceInterruption': parse_flag(item.get('serviceInterruption')),
+            'comment': item.get('comment'),
+            'isActive': True
+        }
+        for field in DAILY_NUMERIC_FIELDS:
+            value = item.get(field)
+            row[field] = float(value) if value not in (None, '') else None
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'Invalid value: {e}')
+    return row
+
+@daily_bp.route('/api/daily/batch', methods=['POST'])
+@token_required
+def create_daily_batch(current_user):
+    data = request.get_json()
+    readings = data.get('readings') if isinstance(data, dict) else data
+    if not isinstance(readings, list) or not readings:
+        return jsonify({'message': 'Expected a non-empty list of readings'}), 400
+    if len(readings) > MAX_BATCH_SIZE:
+        return jsonify({'message': f'Batch too large, at most {MAX_BATCH_SIZE} readings'}), 413
+
+    errors = []
+    parsed = []
+    statuses = status_ids()
+    for index, item in enumerate(readings):
+        try:
+            row = parse_reading(item)
+            row['status'] = resolve_status(row['status'], statuses)
+            parsed.append((index, row))
+        except ValueError as e:
+            errors.append({'index': index, 'message': str(e)})
+
+    # Resolve every referenced branch (and its areaId) in one query
+    branch_ids = {row['branchId'] for _, row in parsed}
+    branch_areas = dict(
+        db.session.query(Branch.id, Branch.areaId).filter(Branch.id.in_(branch_ids)).all()
+    ) if branch_ids else {}
+
+    # Existing readings in the submitted window, fetched once for duplicate checks
+    seen = set()
+    if parsed:
+        dates = [row['date'] for _, row in parsed]
+        seen = set(
+            db.session.query(Daily.branchId, Daily.sourceType, Daily.sourceName, Daily.date)
+            .filter(Daily.branchId.in_(branch_ids))
+            .filter(Daily.date.between(min(dates), max(dates)))
+            .filter(Daily.isActive == True)
+            .all()
+        )
+
+    rows = []
+    for index, row in parsed:
+        if row['branchId'] not in branch_areas:
+            errors.append({'index': index, 'message': f"Branch {row['branchId']} not found"})
+            continue
+        key = (row['branchId'], row['sourceType'], row['sourceName'], row['date'])
+        if key in seen:
+            errors.append({'index': index, 'message': 'Duplicate reading for this source and date'})
+            continue
+        seen.add(key)
+        row['areaId'] = branch_areas[row['branchId']]
+        row['byUser'] = current_user.id
+        rows.append(row)
+
+    if rows:
+        try:
+            # One executemany; with fast_executemany pyodbc sends the rows as a single array
+            db.session.execute(Daily.__table__.insert(), rows)
+            record_rows(db.session, Daily, rows)
+            mark_changed(db.session, Daily)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to insert readings: {str(e)}'}), 500
+
+    errors.sort(key=lambda error: error['index'])
+    return jsonify({
+        'inserted': len(rows),
+        'failed': len(errors),
+        'errors': errors
+    }), 201 if rows else 400
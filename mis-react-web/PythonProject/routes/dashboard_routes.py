@@ -1,20 +1,11 @@
 from flask import Blueprint, jsonify
-from models import User, Area, Branch
 from utils.auth import token_required  # Adjust the import path if needed
+from utils import stats
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
 @dashboard_bp.route('/api/dashboard-stats', methods=['GET'])
 @token_required
 def dashboard_stats(current_user):
-    active_users = User.query.filter_by(isActive=True).count()
-    areas = Area.query.count()
-    branches = Branch.query.count()
-    approved = 0  # Replace with your own logic if needed
-
-    return jsonify({
-        "ActiveUsers": active_users,
-        "Areas": areas,
-        "Branches": branches,
-        "Approved": approved,
-    })
\ No newline at end of file
+    # Maintained counters: no COUNT(*) on the request path between reconciliations
+    return jsonify(stats.dashboard_stats.snapshot())
@@ -0,0 +1,34 @@
+from flask import Blueprint, jsonify, request
+from analytics.energy import load_readings, compute_intensity, intensity_report
+from routes.daily_routes import daily_filters
+from utils.auth import token_required  # Adjust the import path if needed
+from utils.jobs import job_kind
+
+energy_bp = Blueprint('energy', __name__)
+
+def intensity_options(args):
+    # -> (criteria, window, threshold); raises ValueError with the client-facing message
+    window = args.get('window', 7, type=int)
+    threshold = args.get('threshold', 3.0, type=float)
+    if window < 1 or threshold <= 0:
+        raise ValueError('window must be >= 1 and threshold > 0')
+    return daily_filters(args), window, threshold
+
+def energy_intensity_report(criteria, window, threshold, include_days):
+    result = compute_intensity(load_readings(criteria), window=window, z_threshold=threshold)
+    return intensity_report(result, include_days=include_days)
+
+@energy_bp.route('/api/analytics/energy-intensity', methods=['GET'])
+@token_required
+def energy_intensity(current_user):
+    try:
+        options = intensity_options(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify(energy_intensity_report(*options, include_days=request.args.get('days') == '1'))
+
+@job_kind('energy-intensity')
+def energy_intensity_job(params):
+    options = intensity_options(params)
+    include_days = params.get('days') == '1'
+    return lambda job: job.write_json(energy_intensity_report(*options, include_days), 'energy-intensity.json')
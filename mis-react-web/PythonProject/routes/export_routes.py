@@ -0,0 +1,83 @@
+import math
+from flask import Blueprint, jsonify, request
+from models import Daily, Monthly
+from routes.daily_routes import daily_filters
+from routes.monthly_routes import monthly_filters
+from utils.auth import token_required  # Adjust the import path if needed
+from utils.export import (EXPORT_CHUNK_SIZE, EXPORT_MIMETYPES, csv_chunks, export_filename,
+                          export_response, parquet_available, parquet_chunks)
+from utils.jobs import job_kind
+from utils.sync import InvalidSyncToken
+
+export_bp = Blueprint('export', __name__)
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+def export_format():
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return None, (jsonify({'message': f'Unsupported format: {fmt}'}), 400)
+    if fmt == 'parquet' and not parquet_available():
+        return None, (jsonify({'message': 'Parquet export requires pyarrow on the server'}), 501)
+    return fmt, None
+
+def daily_export_query(criteria):
+    columns = list(Daily.__table__.columns)
+    return Daily.query.filter(*criteria).order_by(Daily.date, Daily.id).with_entities(*columns), columns
+
+def monthly_export_query(criteria):
+    columns = list(Monthly.__table__.columns)
+    return Monthly.query.filter(*criteria).order_by(Monthly.id).with_entities(*columns), columns
+
+@export_bp.route('/api/export/daily', methods=['GET'])
+@token_required
+def export_daily(current_user):
+    fmt, error = export_format()
+    if error:
+        return error
+    try:
+        criteria = daily_filters(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    query, columns = daily_export_query(criteria)
+    return export_response(query.statement, columns, 'daily', fmt, Daily)
+
+@export_bp.route('/api/export/monthly', methods=['GET'])
+@token_required
+def export_monthly(current_user):
+    fmt, error = export_format()
+    if error:
+        return error
+    try:
+        criteria = monthly_filters(request.args)
+    except InvalidSyncToken as e:
+        return jsonify({'message': str(e)}), 400
+    query, columns = monthly_export_query(criteria)
+    return export_response(query.statement, columns, 'monthly', fmt, Monthly)
+
+# Background variants (POST /api/jobs/daily-export, /api/jobs/monthly-export) for exports
+# too large to stream within a request; same parameters as the GET routes
+
+def export_job(name, export_query, criteria, params):
+    fmt = params.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported format: {fmt}')
+    if fmt == 'parquet' and not parquet_available():
+        raise ValueError('Parquet export requires pyarrow on the server')
+
+    def run(job):
+        # The query is built on the job thread; only the SQL criteria cross from the request
+        query, columns = export_query(criteria)
+        steps = math.ceil(query.order_by(None).count() / EXPORT_CHUNK_SIZE)
+        chunks = csv_chunks if fmt == 'csv' else parquet_chunks
+        job.write(job.track(chunks(query.statement, columns), steps),
+                  export_filename(name, fmt), EXPORT_MIMETYPES[fmt])
+    return run
+
+@job_kind('daily-export')
+def daily_export_job(params):
+    return export_job('daily', daily_export_query, daily_filters(params), params)
+
+@job_kind('monthly-export')
+def monthly_export_job(params):
+    return export_job('monthly', monthly_export_query, monthly_filters(params), params)
@@ -0,0 +1,66 @@
+from flask import Blueprint, jsonify
+from models import db, active, Area, Branch, BranchSource, BranchSourceName, SourceName, SourceType
+from utils.auth import token_required  # Adjust the import path if needed
+from utils.reference_cache import reference_data
+
+hierarchy_bp = Blueprint('hierarchy', __name__)
+
+def build_hierarchy():
+    # Four column-only queries, one per level, stitched together in memory
+    areas = db.session.query(Area.id, Area.areaCode, Area.areaName).filter(active(Area)).order_by(Area.areaName)
+    branches = (
+        db.session.query(Branch.id, Branch.areaId, Branch.branchCode, Branch.branchName)
+        .filter(active(Branch)).order_by(Branch.branchName)
+    )
+    source_types = (
+        db.session.query(BranchSource.branchId, SourceType.id, SourceType.sourceType)
+        .join(SourceType, SourceType.id == BranchSource.sourceTypeId)
+        .filter(active(BranchSource)).order_by(SourceType.sourceType)
+    )
+    source_names = (
+        db.session.query(BranchSourceName.branchId, SourceType.id, SourceType.sourceType,
+                         SourceName.id, SourceName.sourceName)
+        .join(SourceName, SourceName.id == BranchSourceName.sourceNameId)
+        .join(SourceType, SourceType.id == SourceName.sourceTypeId)
+        .filter(active(BranchSourceName), active(SourceName)).order_by(SourceName.sourceName)
+    )
+
+    tree = []
+    area_nodes = {}
+    for area_id, area_code, area_name in areas:
+        area_nodes[area_id] = {'id': area_id, 'areaCode': area_code, 'areaName': area_name, 'branches': []}
+        tree.append(area_nodes[area_id])
+
+    branch_nodes = {}
+    for branch_id, area_id, branch_code, branch_name in branches:
+        if area_id not in area_nodes:
+            continue  # branch of an inactive or missing area
+        branch_nodes[branch_id] = {'id': branch_id, 'branchCode': branch_code, 'branchName': branch_name,
+                                   'sourceTypes': [], '_types': {}}
+        area_nodes[area_id]['branches'].append(branch_nodes[branch_id])
+
+    def type_node(branch, type_id, type_name):
+        node = branch['_types'].get(type_id)
+        if node is None:
+            node = branch['_types'][type_id] = {'id': type_id, 'sourceType': type_name, 'sourceNames': []}
+            branch['sourceTypes'].append(node)
+        return node
+
+    for branch_id, type_id, type_name in source_types:
+        if branch_id in branch_nodes:
+            type_node(branch_nodes[branch_id], type_id, type_name)
+    # A linked source name whose type is not linked to the branch still gets its type node
+    for branch_id, type_id, type_name, name_id, name in source_names:
+        if branch_id in branch_nodes:
+            type_node(branch_nodes[branch_id], type_id, type_name)['sourceNames'].append(
+                {'id': name_id, 'sourceName': name})
+
+    for branch in branch_nodes.values():
+        del branch['_types']
+    return tree
+
+@hierarchy_bp.route('/api/hierarchy', methods=['GET'])
+@token_required
+@reference_data(Area, Branch, BranchSource, SourceType, SourceName, BranchSourceName)
+def get_hierarchy(current_user):
+    return jsonify(build_hierarchy())
@@ -0,0 +1,78 @@
+import os
+from flask import Blueprint, json, jsonify, request, send_file, url_for
+from models import Job
+from utils.auth import token_required  # Adjust the import path if needed
+from utils.jobs import JOB_KINDS, ACTIVE_STATUSES, JobQueueFull, job_params, job_runner
+
+job_bp = Blueprint('jobs', __name__)
+
+def job_response(job, status=200):
+    body = job.to_dict()
+    body['statusUrl'] = url_for('jobs.get_job', job_id=job.id)
+    if job.status == 'succeeded':
+        body['resultUrl'] = url_for('jobs.get_job_result', job_id=job.id)
+    response = jsonify(body)
+    response.status_code = status
+    if status == 202:
+        response.headers['Location'] = body['statusUrl']
+    return response
+
+def owned_job(job_id, current_user):
+    # Jobs are private to the user who submitted them
+    job = Job.query.filter_by(id=job_id, byUser=current_user.id).first()
+    return job_runner.expire_stale(job) if job else None
+
+@job_bp.route('/api/jobs/<kind>', methods=['POST'])
+@token_required
+def submit_job(current_user, kind):
+    spec = JOB_KINDS.get(kind)
+    if spec is None:
+        return jsonify({'message': f'Unknown job kind: {kind}'}), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        params = job_params(data)
+        run = spec.plan(params)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    encoded = json.dumps(params.to_dict())  # keys sorted, so equal parameters compare equal
+    if len(encoded) > Job.params.type.length:
+        return jsonify({'message': 'Job parameters are too long'}), 400
+
+    # The same report already queued or running for this user is returned instead of repeated
+    pending = (
+        Job.query.filter(Job.byUser == current_user.id, Job.kind == kind,
+                         Job.status.in_(ACTIVE_STATUSES), Job.params == encoded)
+        .order_by(Job.id.desc())
+        .first()
+    )
+    if pending and job_runner.expire_stale(pending).status in ACTIVE_STATUSES:
+        return job_response(pending, 202)
+
+    try:
+        job = job_runner.submit(Job(kind=kind, params=encoded, status='queued', byUser=current_user.id),
+                                params, run, read_replica=spec.read_replica)
+    except JobQueueFull:
+        return jsonify({'message': 'Too many jobs in progress, try again later'}), 503
+    return job_response(job, 202)
+
+@job_bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    job = owned_job(job_id, current_user)
+    if not job:
+        return jsonify({'message': 'Job not found'}), 404
+    return job_response(job)
+
+@job_bp.route('/api/jobs/<int:job_id>/result', methods=['GET'])
+@token_required
+def get_job_result(current_user, job_id):
+    job = owned_job(job_id, current_user)
+    if not job:
+        return jsonify({'message': 'Job not found'}), 404
+    if job.status != 'succeeded':
+        return jsonify({'message': f'Job is {job.status}'}), 409
+    path = job_runner.result_path(job.id)
+    if not os.path.exists(path):
+        return jsonify({'message': 'Job result has been removed'}), 410
+    return send_file(path, mimetype=job.resultType, as_attachment=True,
+                     download_name=job.resultName, conditional=True, max_age=0)
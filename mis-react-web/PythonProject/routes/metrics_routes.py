@@ -0,0 +1,13 @@
+import hmac
+from flask import Blueprint, Response, current_app, request
+from utils.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/api/metrics', methods=['GET'])
+def metrics():
+    # Prometheus scrape target; guarded by METRICS_TOKEN when one is configured
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
@@ -1,42 +1,43 @@
-from flask import Blueprint, jsonify
-from models import Monthly
+from flask import Blueprint, jsonify, request
+from models import active, Monthly
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.streaming import wants_stream, ndjson_response
+from utils.serializers import serializer, parse_fields, row_serializer
+from utils.sync import changed_since, sync_fields, sync_token
 
 monthly_bp = Blueprint('monthly', __name__)
 
+monthly_to_dict = serializer(Monthly)
+
+def monthly_filters(args):
+    # Listing/export query string -> SQL criteria
+    criteria = changed_since(Monthly, args)
+    if criteria is None:
+        criteria = [] if args.get('includeInactive') == '1' else [active(Monthly)]
+    for field in ('branchId', 'year', 'status', 'sourceType'):
+        value = args.get(field, type=int)
+        if value:
+            criteria.append(getattr(Monthly, field) == value)
+    if args.get('month'):
+        criteria.append(Monthly.month == args['month'])
+    return criteria
+
 @monthly_bp.route('/api/monthly', methods=['GET'])
 @token_required
+@sync_token
 def get_all_monthly(current_user):
-    items = Monthly.query.all()
-    def monthly_to_dict(m):
-        return {
-            'id': m.id,
-            'branchId': m.branchId,
-            'sourceType': m.sourceType,
-            'sourceName': m.sourceName,
-            'status': m.status,
-            'byUser': m.byUser,
-            'month': m.month,
-            'year': m.year,
-            'electricityConsumption': m.electricityConsumption,
-            'electricityCost': m.electricityCost,
-            'bulkCost': m.bulkCost,
-            'bulkOuttake': m.bulkOuttake,
-            'bulkProvider': m.bulkProvider,
-            'WTPCost': m.WTPCost,
-            'WTPSource': m.WTPSource,
-            'WTPVolume': m.WTPVolume,
-            'disinfectionMode': m.disinfectionMode,
-            'disinfectantCost': m.disinfectantCost,
-            'disinfectionAmount': m.disinfectionAmount,
-            'disinfectionBrandType': m.disinfectionBrandType,
-            'otherTreatmentCost': m.otherTreatmentCost,
-            'emergencyLitersConsumed': m.emergencyLitersConsumed,
-            'emergencyFuelCost': m.emergencyFuelCost,
-            'emergencyTotalHoursUsed': m.emergencyTotalHoursUsed,
-            'gensetLitersConsumed': m.gensetLitersConsumed,
-            'gensetFuelCost': m.gensetFuelCost,
-            'isActive': m.isActive,
-            'comment': m.comment
-        }
-    return jsonify([monthly_to_dict(m) for m in items])
\ No newline at end of file
+    try:
+        fields = parse_fields(Monthly, request.args.get('fields'), sync_fields(request.args))
+        criteria = monthly_filters(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    query = Monthly.query.filter(*criteria)
+    serialize = monthly_to_dict
+    if fields:
+        # Column-only select: unrequested columns are neither read nor encoded
+        query = query.with_entities(*(getattr(Monthly, key) for key in fields))
+        serialize = row_serializer(fields)
+    if wants_stream():
+        return ndjson_response(query.order_by(Monthly.id), serialize)
+    items = query.all()
+    return jsonify([serialize(m) for m in items])
\ No newline at end of file
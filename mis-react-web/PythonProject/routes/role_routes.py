@@ -1,18 +1,16 @@
 from flask import Blueprint, jsonify
 from models import Role
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.reference_cache import reference_data
 
 role_bp = Blueprint('role', __name__)
 
 @role_bp.route('/api/roles', methods=['GET'])
 @token_required
+@reference_data(Role)
 def get_all_roles(current_user):
     try:
         roles = Role.query.all()
-        return jsonify([{
-            'id': role.id,
-            'roleName': role.roleName,
-            'description': role.description
-        } for role in roles])
+        return jsonify([role.to_dict() for role in roles])
     except Exception as e:
         return jsonify({'message': f'Failed to get roles: {str(e)}'}), 500
\ No newline at end of file
@@ -1,19 +1,28 @@
 from flask import Blueprint, request, jsonify
 from models import db, SourceType, SourceName
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.reference_cache import reference_data
+from utils.sync import InvalidSyncToken, changed_since, sync_token
 
 source_bp = Blueprint('source', __name__)
 
 @source_bp.route('/api/source-types', methods=['GET'])
 @token_required
+@reference_data(SourceType)
 def get_all_source_types(current_user):
     items = SourceType.query.all()
     return jsonify([item.to_dict() for item in items])
 
 @source_bp.route('/api/source-names', methods=['GET'])
 @token_required
+@sync_token
+@reference_data(SourceName)
 def get_all_source_names(current_user):
-    items = SourceName.query.all()
+    try:
+        criteria = changed_since(SourceName, request.args) or []
+    except InvalidSyncToken as e:
+        return jsonify({'message': str(e)}), 400
+    items = SourceName.query.filter(*criteria).all()
     return jsonify([item.to_dict() for item in items])
 
 @source_bp.route('/api/source-names', methods=['POST'])
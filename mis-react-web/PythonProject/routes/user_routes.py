@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from models import User
 from utils.auth import token_required  # Adjust the import path if needed
+from utils.sync import InvalidSyncToken, changed_since, sync_token
 
 user_bp = Blueprint('user', __name__)
 
@@ -14,9 +15,13 @@ def get_profile(current_user):
 
 @user_bp.route('/api/users', methods=['GET'])
 @token_required
+@sync_token
 def get_all_users(current_user):
     try:
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users])
+        criteria = changed_since(User, request.args) or []
+    except InvalidSyncToken as e:
+        return jsonify({'message': str(e)}), 400
+    try:
+        return jsonify(User.directory(*criteria))
     except Exception as e:
         return jsonify({'message': f'Failed to get users: {str(e)}'}), 500
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Production entry point.
+
+Runs the app under gunicorn (Linux) with WEB_WORKERS processes of
+WEB_THREADS threads each, or under waitress (Windows, no fork) with
+WEB_THREADS threads. Each worker sizes its own connection pool to its
+thread count unless DB_POOL_SIZE is set, so the database sees at most
+workers * (pool size + overflow) connections.
+
+    python serve.py
+    WEB_WORKERS=8 WEB_THREADS=4 WEB_BIND=0.0.0.0:8000 python serve.py
+
+Graceful restart (gunicorn): kill -HUP <master pid> starts fresh workers and
+lets the old ones finish in-flight requests within WEB_GRACEFUL_TIMEOUT.
+With WEB_PRELOAD=1 the app is imported once in the master (faster worker
+start, shared memory), but HUP then does not pick up code changes; send
+USR2 followed by TERM to the old master instead.
+"""
+import multiprocessing
+import os
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_preloaded = None
+
+
+def server_settings():
+    workers = int(os.getenv('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+    threads = int(os.getenv('WEB_THREADS', 4))
+    return {
+        'bind': os.getenv('WEB_BIND', '0.0.0.0:5000'),
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': os.getenv('WEB_PRELOAD', '0') == '1',
+        'timeout': int(os.getenv('WEB_TIMEOUT', 60)),  # seconds a worker may stall before it is killed
+        'graceful_timeout': int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30)),  # seconds to drain on restart
+        'keepalive': int(os.getenv('WEB_KEEPALIVE', 5)),
+        # Recycle workers after this many requests (0 = never), jittered so they do not restart together
+        'max_requests': int(os.getenv('WEB_MAX_REQUESTS', 0)),
+        'max_requests_jitter': int(os.getenv('WEB_MAX_REQUESTS_JITTER', 50)),
+        'accesslog': os.getenv('WEB_ACCESS_LOG') or None,
+    }
+
+
+def worker_config(threads):
+    # One pooled connection per request thread; overflow absorbs streaming exports and background work
+    return {
+        'DB_POOL_SIZE': int(os.getenv('DB_POOL_SIZE', threads)),
+        'DB_MAX_OVERFLOW': int(os.getenv('DB_MAX_OVERFLOW', max(threads // 2, 1))),
+    }
+
+
+def post_fork(server, worker):
+    # Connections and the log writer thread do not survive fork; each preloaded worker gets its own
+    if _preloaded is None:
+        return
+    from utils.database import dispose_engines
+    dispose_engines(_preloaded)
+    _preloaded.extensions['log_listener'].start()
+
+
+def run_gunicorn(settings):
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+            self.cfg.set('post_fork', post_fork)
+
+        def load(self):
+            global _preloaded
+            from app import create_app
+            app = create_app(worker_config(settings['threads']))
+            if settings['preload_app']:
+                _preloaded = app
+            return app
+
+    Server().run()
+
+
+def run_waitress(settings):
+    from waitress import serve
+    from app import create_app
+    host, _, port = settings['bind'].rpartition(':')
+    app = create_app(worker_config(settings['threads']))
+    serve(app, host=host or '0.0.0.0', port=int(port), threads=settings['threads'])
+
+
+def main():
+    settings = server_settings()
+    if sys.platform == 'win32':
+        run_waitress(settings)
+    else:
+        run_gunicorn(settings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import datetime
+import jwt
+import pytest
+from app import create_app
+from models import db, Area, Branch, Role, Status, User
+from utils.branch_cache import branch_cache
+from utils.export import export_cache
+from utils.reference_cache import reference_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}',
+        'DATABASE_READ_URL': None,
+        'JOB_RESULT_DIR': str(tmp_path / 'job-results'),
+        'TESTING': True,
+    })
+    for cache in (reference_cache, branch_cache, export_cache):
+        cache.clear()  # process-wide; versions restart at 0 in each test database
+    with app.app_context():
+        db.create_all()
+        db.session.add(Role(roleName='Super Admin'))
+        db.session.add(Area(areaCode=1, areaName='North', isActive=True))
+        db.session.flush()
+        db.session.add(Branch(areaId=1, branchCode=100, branchName='Main', isActive=True))
+        for name in ('Accepted', 'Pending', 'Rejected'):
+            db.session.add(Status(statusName=name))
+        db.session.flush()
+        db.session.add(User(roleId=1, areaId=1, branchId=1, userName='admin', firstName='A',
+                            lastName='B', email='admin@example.com', passwordHash='pw', isActive=True))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(app):
+    token = jwt.encode({'user_id': 1, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['JWT_SECRET_KEY'], algorithm='HS256')
+    return {'Authorization': f'Bearer {token}'}
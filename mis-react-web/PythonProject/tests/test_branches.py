@@ -0,0 +1,43 @@
+from models import db, Branch, BranchSource, SourceName, SourceType
+
+
+def add_source_type():
+    db.session.add(SourceType(sourceType='Well'))
+    db.session.commit()
+
+
+def test_full_create_provisions_several_branches_in_one_transaction(client):
+    add_source_type()
+    response = client.post('/api/branch/full-create', json={'branches': [
+        {'areaId': 1, 'branchName': 'East', 'sourceTypes': [{'id': 1, 'sourceNames': ['E1', 'E2']}]},
+        {'areaId': 1, 'branchName': 'West', 'sourceTypes': [{'id': 1, 'sourceNames': ['W1']}]},
+    ]})
+    assert response.status_code == 201
+    east, west = response.get_json()['branchIds']
+    assert sorted(name.sourceName for name in SourceName.query.filter_by(branchId=east)) == ['E1', 'E2']
+    assert BranchSource.query.filter_by(branchId=west).count() == 1
+
+
+def test_full_create_validates_every_spec_before_inserting(client):
+    add_source_type()
+    response = client.post('/api/branch/full-create', json=[
+        {'areaId': 1, 'branchName': 'East', 'sourceTypes': [{'id': 1, 'sourceNames': ['E1']}]},
+        {'areaId': 1, 'branchName': 'West', 'sourceTypes': [{'id': '1'}]},
+    ])
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Branch 1: every source type needs an integer id'
+    assert Branch.query.count() == 1
+
+
+def test_branch_details_etag_follows_link_changes(client):
+    add_source_type()
+    first = client.get('/api/branch/1/details')
+    assert first.get_json()['sourceTypes'] == []
+    etag = first.headers['ETag']
+    assert client.get('/api/branch/1/details', headers={'If-None-Match': etag}).status_code == 304
+
+    db.session.add(BranchSource(branchId=1, sourceTypeId=1))
+    db.session.commit()
+    second = client.get('/api/branch/1/details', headers={'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['sourceTypes'] == [{'id': 1, 'name': 'Well'}]
@@ -0,0 +1,106 @@
+from datetime import datetime
+import pytest
+from werkzeug.datastructures import MultiDict
+from models import db, Daily
+from routes.daily_routes import daily_filters
+
+
+def add_daily(status, date='2026-10-01'):
+    db.session.add(Daily(branchId=1, areaId=1, sourceType='Well', sourceName='W1', status=status,
+                         date=datetime.fromisoformat(date), isActive=True))
+    db.session.commit()
+
+
+def test_daily_filters_resolve_status_names(app):
+    add_daily(2)
+    add_daily(1)
+    for value in ('Pending', 'pending', '2'):
+        rows = Daily.query.filter(*daily_filters(MultiDict({'status': value}))).all()
+        assert [row.status for row in rows] == [2]
+
+
+@pytest.mark.parametrize('args, message', [
+    ({'status': 'Unknown'}, 'Unknown status: Unknown'),
+    ({'dateFrom': '2026-13-01'}, 'Invalid date filter, expected YYYY-MM-DD'),
+])
+def test_daily_filters_reject_bad_values(app, args, message):
+    with pytest.raises(ValueError, match=message):
+        daily_filters(MultiDict(args))
+
+
+def test_daily_listing_filters_by_status(client, auth):
+    add_daily(2)
+    add_daily(3, '2026-10-02')
+    response = client.get('/api/daily?status=Rejected', headers=auth)
+    assert response.status_code == 200
+    assert [item['status'] for item in response.get_json()['items']] == [3]
+    response = client.get('/api/daily?status=Unknown', headers=auth)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Unknown status: Unknown'
+
+
+def reading(**values):
+    return {'branchId': 1, 'sourceType': 'Well', 'sourceName': 'W1', 'date': '2026-10-01',
+            'productionVolume': '12.5', **values}
+
+
+def test_batch_inserts_valid_readings_and_reports_the_rest(client, auth):
+    add_daily(1, '2026-10-03')
+    response = client.post('/api/daily/batch', headers=auth, json={'readings': [
+        reading(),
+        reading(date='2026-10-02', status='rejected', serviceInterruption='false'),
+        reading(sourceName='W2', status='Unknown'),
+        reading(branchId=99),
+        reading(date='2026-10-03'),                 # already stored
+        reading(date='2026-10-02'),                 # repeats reading 1 of this batch
+        reading(serviceInterruption='maybe'),
+        {'branchId': 1},
+    ]})
+    assert response.status_code == 201
+    body = response.get_json()
+    assert (body['inserted'], body['failed']) == (2, 6)
+    assert [error['index'] for error in body['errors']] == [2, 3, 4, 5, 6, 7]
+    assert body['errors'][0]['message'] == 'Unknown status: Unknown'
+    assert body['errors'][1]['message'] == 'Branch 99 not found'
+
+    rows = Daily.query.filter(Daily.date < datetime(2026, 10, 3)).order_by(Daily.date).all()
+    assert [(row.status, row.serviceInterruption, row.areaId, row.byUser) for row in rows] == [
+        (2, False, 1, 1), (3, False, 1, 1)]
+
+
+def test_batch_with_no_valid_reading_is_rejected(client, auth):
+    response = client.post('/api/daily/batch', headers=auth, json=[reading(branchId=99)])
+    assert response.status_code == 400
+    assert response.get_json()['inserted'] == 0
+    assert client.post('/api/daily/batch', headers=auth, json=[]).status_code == 400
+
+
+def test_keyset_cursor_walks_every_row_once(client, auth):
+    for day in range(1, 6):
+        add_daily(2, f'2026-10-0{day}')
+        add_daily(2, f'2026-10-0{day}')
+    seen, cursor = [], None
+    while True:
+        query = '/api/daily?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(query, headers=auth).get_json()
+        seen.extend(item['id'] for item in body['items'])
+        cursor = body['nextCursor']
+        if not cursor:
+            break
+    assert seen == sorted(seen, reverse=True) and sorted(seen) == list(range(1, 11))
+    assert client.get('/api/daily?cursor=junk', headers=auth).status_code == 400
+
+
+def test_sync_token_returns_only_later_changes(app, client, auth):
+    app.config['SYNC_TOKEN_LAG'] = 0
+    add_daily(2)
+    first = client.get('/api/daily', headers=auth)
+    token = first.headers['X-Sync-Token']
+    assert 'X-Sync-Token' not in client.get('/api/daily?cursor=x', headers=auth).headers
+
+    Daily.query.get(1).isActive = False  # soft delete, still reported in the delta
+    db.session.commit()
+    add_daily(1, '2026-10-02')
+    body = client.get(f'/api/daily?since={token}', headers=auth).get_json()
+    assert sorted((item['id'], item['isActive']) for item in body['items']) == [(1, False), (2, True)]
+    assert client.get('/api/daily?since=junk', headers=auth).status_code == 400
@@ -0,0 +1,16 @@
+import io
+from datetime import datetime
+import pyarrow.parquet as pq
+from models import db, Daily
+
+
+def test_daily_parquet_export_keeps_status_ids(client, auth):
+    for status in (1, 2):
+        db.session.add(Daily(branchId=1, areaId=1, sourceType='Well', sourceName='W1', status=status,
+                             date=datetime(2026, 10, status), productionVolume=1.5, isActive=True))
+    db.session.commit()
+    response = client.get('/api/export/daily?format=parquet', headers=auth)
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.get_data()))
+    assert str(table.schema.field('status').type) == 'int64'
+    assert sorted(table.column('status').to_pylist()) == [1, 2]
@@ -0,0 +1,16 @@
+from datetime import date, datetime
+from flask import json, jsonify
+from models import db, Branch
+
+
+def test_dates_keep_the_http_date_format(app):
+    with app.test_request_context():
+        body = jsonify({'at': datetime(2026, 10, 17), 'on': date(2026, 10, 17)}).get_json()
+    assert body == {'at': 'Sat, 17 Oct 2026 00:00:00 GMT', 'on': 'Sat, 17 Oct 2026 00:00:00 GMT'}
+    assert json.dumps({'at': datetime(2026, 10, 17, 8, 30)}) == '{"at":"Sat, 17 Oct 2026 08:30:00 GMT"}'
+
+
+def test_payloads_leave_out_the_change_stamp(app):
+    branch = Branch.query.get(1)
+    assert 'updatedAt' not in branch.to_dict()
+    assert set(branch.to_dict()) >= {'id', 'branchName', 'isActive'}
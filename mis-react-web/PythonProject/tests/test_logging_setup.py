@@ -0,0 +1,18 @@
+import logging
+import pytest
+from utils.logging_setup import parse_level, parse_route_levels
+
+
+def test_route_levels_parse_known_names():
+    assert parse_route_levels('auth.login=debug, daily.get_all_daily=WARNING') == {
+        'auth.login': logging.DEBUG, 'daily.get_all_daily': logging.WARNING}
+
+
+@pytest.mark.parametrize('parse', [
+    lambda: parse_level('VERBOSE', 'LOG_LEVEL'),
+    lambda: parse_route_levels('auth.login=DEBG'),
+    lambda: parse_route_levels('auth.login'),
+])
+def test_unknown_level_is_a_config_error(parse):
+    with pytest.raises(ValueError, match='unknown log level'):
+        parse()
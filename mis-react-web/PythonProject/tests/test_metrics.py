@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models import db, Area
+from utils.metrics import SQL_ROWS
+
+
+def fetched():
+    return SQL_ROWS._values.get(('-', 'fetched'), 0)
+
+
+def test_column_only_selects_count_fetched_rows(app):
+    before = fetched()
+    rows = db.session.query(Area.id, Area.areaName).all()
+    assert fetched() - before == len(rows) == 1
+    with db.engine.connect() as connection:
+        result = connection.execution_options(stream_results=True).execute(text('SELECT id FROM Role'))
+        assert result.fetchmany(10) and fetched() - before == 2
+
+
+def test_failed_statement_does_not_leak_its_start_time(app):
+    with db.engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text('SELECT * FROM NoSuchTable'))
+        assert not connection.info.get('query_started')
+        connection.execute(text('SELECT 1')).fetchall()
+        assert not connection.info.get('query_started')
@@ -0,0 +1,20 @@
+import pytest
+from utils.passwords import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    return PasswordHasher(rounds=4, workers=1)
+
+
+def test_bcrypt_hash_verifies(hasher):
+    stored = hasher.hash('secret')
+    assert hasher.verify('secret', stored) == (True, None)
+    assert hasher.verify('wrong', stored) == (False, None)
+
+
+@pytest.mark.parametrize('stored', ['$2secret', '$2b$04$truncated', '$2é', '$2b$99$' + 'a' * 53])
+def test_values_that_only_look_like_bcrypt_are_compared_as_plaintext(hasher, stored):
+    assert hasher.verify('wrong', stored) == (False, None)
+    matched, rehash = hasher.verify(stored, stored)
+    assert matched and rehash.startswith('$2b$04$')
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mssql
+from models import Daily
+from utils import periods
+
+
+@pytest.mark.parametrize('period', periods.PERIODS)
+def test_mssql_period_groups_by_the_selected_expression(monkeypatch, period):
+    monkeypatch.setattr(periods, 'db', SimpleNamespace(engine=SimpleNamespace(dialect=mssql.dialect())))
+    expression = periods.period_expression(Daily.date, period)
+    compiled = select([expression]).group_by(expression).compile(dialect=mssql.dialect())
+    assert compiled.params == {}
+    selected, grouped = str(compiled).split(' GROUP BY ')
+    assert grouped.strip() in selected
+
+
+def test_sqlite_rollup_by_month(client, auth):
+    response = client.get('/api/analytics/daily-rollup?groupBy=month', headers=auth)
+    assert response.status_code == 200
+    assert response.get_json()['rows'] == []
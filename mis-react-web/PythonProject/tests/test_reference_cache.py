@@ -0,0 +1,31 @@
+from sqlalchemy import text
+from models import db, Area
+
+
+def test_cached_listing_follows_writes_committed_by_another_worker(client, auth):
+    first = client.get('/api/areas', headers=auth)
+    assert [area['areaName'] for area in first.get_json()] == ['North']
+    assert client.get('/api/areas', headers={**auth, 'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    # Another worker commits a new area and bumps the shared version, leaving this
+    # process's cached body untouched
+    with db.engine.begin() as connection:
+        connection.execute(text("INSERT INTO Area (areaCode, areaName, isActive) VALUES (2, 'South', 1)"))
+        connection.execute(text("UPDATE CacheVersion SET version = version + 1 WHERE name = 'Area'"))
+
+    second = client.get('/api/areas', headers={**auth, 'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert [area['areaName'] for area in second.get_json()] == ['North', 'South']
+
+
+def area_version():
+    return db.session.execute(text("SELECT version FROM CacheVersion WHERE name = 'Area'")).scalar()
+
+
+def test_commits_bump_the_shared_version(app):
+    before = area_version()
+    db.session.add(Area(areaCode=3, areaName='East', isActive=True))
+    db.session.commit()
+    db.session.add(Area(areaCode=4, areaName='West', isActive=True))
+    db.session.commit()
+    assert area_version() == before + 2
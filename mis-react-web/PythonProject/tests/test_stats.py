@@ -0,0 +1,21 @@
+from datetime import datetime
+from models import db, Daily, Monthly
+from utils.stats import dashboard_stats
+
+
+def test_daily_and_monthly_statuses_are_reported_by_name(app):
+    db.session.add(Daily(branchId=1, areaId=1, sourceType='Well', sourceName='W1', status=2,
+                         date=datetime(2026, 10, 1), isActive=True))
+    db.session.add(Monthly(branchId=1, year=2026, month='October', status=2, isActive=True))
+    db.session.add(Monthly(branchId=1, year=2026, month='September', status=1, isActive=True))
+    db.session.commit()
+    dashboard_stats.reconcile()
+
+    db.session.add(Daily(branchId=1, areaId=1, sourceType='Well', sourceName='W1', status=1,
+                         date=datetime(2026, 10, 2), isActive=True))
+    db.session.commit()  # counted incrementally on commit
+
+    stats = dashboard_stats.snapshot()
+    assert stats['Daily'] == {'Pending': 1, 'Accepted': 1}
+    assert stats['Monthly'] == {'Pending': 1, 'Accepted': 1}
+    assert (stats['Approved'], stats['Pending'], stats['Encoded']) == (2, 2, 4)
@@ -1,7 +1,43 @@
 from functools import wraps
 from flask import request, jsonify, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
 import jwt
 from models import User
+from utils.cache import TTLCache
+
+# Column snapshots of authenticated users, keyed by user id
+principal_cache = TTLCache(maxsize=1024, ttl=60)
+
+def init_principal_cache(app):
+    principal_cache.configure(
+        maxsize=app.config.get('PRINCIPAL_CACHE_SIZE'),
+        ttl=app.config.get('PRINCIPAL_CACHE_TTL')
+    )
+
+def invalidate_principal(user_id):
+    # Call after bulk updates (Query.update) that bypass the mapper events below
+    principal_cache.pop(user_id)
+
+def _invalidate_on_write(mapper, connection, target):
+    invalidate_principal(target.id)
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(User, _event_name, _invalidate_on_write)
+
+def load_principal(user_id):
+    state = principal_cache.get(user_id)
+    if state is None:
+        user = User.query.get(user_id)
+        if user:
+            principal_cache.set(user_id, {
+                column.key: getattr(user, column.key) for column in User.__table__.columns
+            })
+        return user
+    # Fresh detached instance per request so no ORM object is shared between threads
+    user = User(**state)
+    make_transient_to_detached(user)
+    return user
 
 def token_required(f):
     @wraps(f)
@@ -12,10 +48,10 @@ def token_required(f):
         try:
             token = token.split(' ')[1]  # Remove 'Bearer ' prefix
             data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            current_user = load_principal(data['user_id'])
             if not current_user:
                 return jsonify({'message': 'User not found'}), 401
         except Exception:
             return jsonify({'message': 'Token is invalid'}), 401
         return f(current_user, *args, **kwargs)
-    return decorated
\ No newline at end of file
+    return decorated
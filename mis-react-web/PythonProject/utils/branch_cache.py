@@ -0,0 +1,55 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models import Branch, BranchSource, BranchSourceName, SourceType, SourceName
+from utils.reference_cache import ReferenceCache, bump_versions
+
+# Branch detail bodies, one entry per branch. An entry is valid while its branch's
+# version and the shared source-catalogue version are unchanged.
+branch_cache = ReferenceCache()
+
+CATALOGUE = 'source-catalogue'  # SourceType/SourceName rows are shared by every branch
+
+
+def init_branch_cache(app):
+    branch_cache.configure(maxsize=app.config.get('BRANCH_CACHE_SIZE'), ttl=app.config.get('REFERENCE_CACHE_TTL'))
+
+
+def branch_version(branch_id):
+    return branch_cache.version([('branch', branch_id), CATALOGUE])
+
+
+def _branch_keys(instance):
+    if isinstance(instance, Branch):
+        return {('branch', instance.id)}
+    if isinstance(instance, (BranchSource, BranchSourceName)):
+        # A link moved to another branch invalidates both the old and the new branch
+        history = inspect(instance).attrs.branchId.history
+        return {('branch', branch_id) for branch_id in
+                [instance.branchId, *history.deleted] if branch_id is not None}
+    if isinstance(instance, (SourceType, SourceName)):
+        return {CATALOGUE}
+    return set()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_branches(session, flush_context):
+    changed = session.info.setdefault('branch_changes', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        changed.update(_branch_keys(instance))
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_branches(session):
+    changed = session.info.pop('branch_changes', None)
+    if changed:
+        bump_versions(branch_cache, changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_branches(session):
+    session.info.pop('branch_changes', None)
+
+
+def mark_branches_changed(session, *branch_ids):
+    # For link rows written without the unit of work (bulk_insert_mappings)
+    session.info.setdefault('branch_changes', set()).update(('branch', branch_id) for branch_id in branch_ids)
@@ -0,0 +1,85 @@
+import gzip
+import zlib
+from flask import request
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain')
+
+
+class ResponseCompressor:
+    # gzip/brotli content negotiation. On-the-fly compression uses fast levels;
+    # bodies compressed once and cached use the best ones.
+
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def encodings(self):
+        return ('br', 'gzip') if brotli else ('gzip',)
+
+    def negotiate(self):
+        # Best encoding the client accepts (brotli wins ties), or None for identity
+        return request.accept_encodings.best_match(self.encodings())
+
+    def compress(self, data, encoding, best=False):
+        if encoding == 'br':
+            return brotli.compress(data, quality=11 if best else self.brotli_quality)
+        return gzip.compress(data, compresslevel=9 if best else self.gzip_level, mtime=0)
+
+    def compress_chunks(self, chunks, encoding, best=False):
+        # Flushes after every chunk so streamed responses still arrive progressively
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=11 if best else self.brotli_quality)
+            compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(9 if best else self.gzip_level, zlib.DEFLATED, 31)
+            compress, finish = compressor.compress, compressor.flush
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        for chunk in chunks:
+            data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+
+    def apply(self, response):
+        if response.status_code != 200 or response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            # Closing the wrapper must still close the source so stream_with_context tears down
+            source = response.response
+            response.response = ClosingIterator(self.compress_chunks(source, encoding), getattr(source, 'close', None))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            compressed = self.compress(data, encoding)
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+            etag, weak = response.get_etag()
+            if etag:
+                response.set_etag(f'{etag}-{encoding}', weak)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+response_compressor = ResponseCompressor()
+
+def init_compression(app):
+    response_compressor.min_size = app.config.get('COMPRESS_MIN_SIZE', response_compressor.min_size)
+    response_compressor.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', response_compressor.gzip_level)
+    response_compressor.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', response_compressor.brotli_quality)
+    app.after_request(response_compressor.apply)
@@ -0,0 +1,87 @@
+from flask import g, has_app_context, request
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import orm
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(SignallingSession):
+    # Reads in a request or background job marked read-only (g.read_replica, which lives on
+    # the app context) go to the replica; flushes always go to the primary
+    def __init__(self, db, **options):
+        self.db = db
+        super().__init__(db, **options)
+
+    def get_bind(self, mapper=None, clause=None):
+        if not self._flushing and has_app_context() and g.get('read_replica'):
+            return self.db.get_engine(self.app, bind=REPLICA_BIND)
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def engine_options(app, uri):
+    from utils.metrics import TimedQueuePool
+    uri = uri or ''
+    options = {'pool_pre_ping': app.config['DB_POOL_PRE_PING']}
+    if uri.startswith('mssql+pyodbc'):
+        # Send executemany parameter sets to SQL Server as one array (bulk Daily inserts)
+        options['fast_executemany'] = True
+    if not uri.startswith('sqlite'):
+        options.update(
+            poolclass=TimedQueuePool,  # reports checkout waits to /api/metrics
+            pool_size=app.config['DB_POOL_SIZE'],
+            max_overflow=app.config['DB_MAX_OVERFLOW'],
+            pool_timeout=app.config['DB_POOL_TIMEOUT'],
+            pool_recycle=app.config['DB_POOL_RECYCLE'])
+    return options
+
+
+def init_database(app):
+    # Engine options apply to every bind, so primary and replica are sized alike
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app, app.config['SQLALCHEMY_DATABASE_URI'])
+    replica_url = app.config.get('DATABASE_READ_URL')
+    if not replica_url:
+        return
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds[REPLICA_BIND] = replica_url
+    app.config['SQLALCHEMY_BINDS'] = binds
+    blueprints = {name.strip() for name in app.config['READ_REPLICA_BLUEPRINTS'].split(',') if name.strip()}
+
+    @app.before_request
+    def _route_reads_to_replica():
+        # Replica lag is acceptable for reporting reads; anything that writes stays on the primary
+        if request.method == 'GET' and request.blueprint in blueprints:
+            g.read_replica = True
+
+
+def has_replica(app):
+    return REPLICA_BIND in (app.config.get('SQLALCHEMY_BINDS') or {})
+
+
+def pool_status(app):
+    # {bind: {state: connections}} for every configured engine with a queue pool
+    from models import db
+    status = {}
+    for bind in [None] + list(app.config.get('SQLALCHEMY_BINDS') or {}):
+        pool = db.get_engine(app, bind=bind).pool
+        if not hasattr(pool, 'checkedout'):
+            continue
+        status[bind or 'primary'] = {
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        }
+    return status
+
+
+def dispose_engines(app):
+    # Drop pooled connections inherited across fork so the new process opens its own
+    from models import db
+    with app.app_context():
+        for bind in [None] + list(app.config.get('SQLALCHEMY_BINDS') or {}):
+            db.get_engine(app, bind=bind).dispose()
@@ -0,0 +1,158 @@
+import csv
+import io
+from datetime import datetime
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import Boolean, DateTime, Float, Integer
+from models import db
+from utils.cache import TTLCache
+from utils.compression import response_compressor
+from utils.reference_cache import reference_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # listed in requirements.txt; without it ?format=parquet answers 501
+    pa = None
+
+EXPORT_CHUNK_SIZE = 10000
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+EXPORT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # compressed bodies larger than this are streamed, not kept
+
+# (endpoint, query string, encoding) -> (table version, compressed CSV body)
+export_cache = TTLCache(maxsize=16, ttl=300)
+
+
+def init_export_cache(app):
+    export_cache.configure(maxsize=app.config.get('EXPORT_CACHE_SIZE'), ttl=app.config.get('REFERENCE_CACHE_TTL'))
+
+
+def fetch_chunks(statement, chunk_size=EXPORT_CHUNK_SIZE):
+    # Plain row tuples from a streaming cursor, never more than one chunk in memory
+    result = db.session.execute(statement.execution_options(stream_results=True))
+    try:
+        while True:
+            chunk = result.fetchmany(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        result.close()
+
+
+def csv_chunks(statement, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in columns])
+    for chunk in fetch_chunks(statement):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def arrow_schema(columns):
+    def arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp('ms')
+        return pa.string()
+    return pa.schema([(column.key, arrow_type(column)) for column in columns])
+
+
+class _ChunkSink(io.RawIOBase):
+    # Write-only file that hands everything written so far to the response generator
+    def __init__(self):
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_chunks(statement, columns):
+    # One Parquet row group per fetched chunk, built as an Arrow record batch
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    for chunk in fetch_chunks(statement):
+        arrays = [
+            pa.array(values, type=field.type)
+            for values, field in zip(zip(*chunk), schema)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def _keep_compressed(chunks, key, version, max_bytes):
+    # Passes compressed chunks through and caches the whole body if it completes within max_bytes
+    parts, size = [], 0
+    for chunk in chunks:
+        yield chunk
+        if parts is not None:
+            size += len(chunk)
+            if size <= max_bytes:
+                parts.append(chunk)
+            else:
+                parts = None
+    if parts is not None:
+        export_cache.set(key, (version, b''.join(parts)))
+
+
+def csv_response(statement, columns, model):
+    # Compressed CSV is cached per query string until `model`'s table changes
+    encoding = response_compressor.negotiate()
+    if encoding is None:
+        return Response(stream_with_context(csv_chunks(statement, columns)), mimetype='text/csv')
+    key = (request.endpoint, request.query_string, encoding)
+    version = reference_cache.version([model.__table__.name])
+    cached = export_cache.get(key)
+    if cached is not None and cached[0] == version:
+        body = [cached[1]]
+    else:
+        compressed = response_compressor.compress_chunks(csv_chunks(statement, columns), encoding)
+        max_bytes = current_app.config.get('EXPORT_CACHE_MAX_BYTES', EXPORT_CACHE_MAX_BYTES)
+        body = stream_with_context(_keep_compressed(compressed, key, version, max_bytes))
+    response = Response(body, mimetype='text/csv')
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def export_filename(name, fmt):
+    return f"{name}-{datetime.now().strftime('%Y%m%d')}.{fmt}"
+
+
+def export_response(statement, columns, name, fmt, model):
+    # fmt is 'csv' or 'parquet'; callers validate it and check parquet_available()
+    filename = export_filename(name, fmt)
+    if fmt == 'parquet':
+        # Parquet pages are already zstd-compressed, so no content encoding on top
+        response = Response(stream_with_context(parquet_chunks(statement, columns)),
+                            mimetype=EXPORT_MIMETYPES['parquet'])
+    else:
+        response = csv_response(statement, columns, model)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def parquet_available():
+    return pa is not None
@@ -0,0 +1,89 @@
+import re
+import click
+from flask.cli import with_appcontext
+from werkzeug.datastructures import MultiDict
+from models import db, active, User, Monthly, SourceName, Daily
+
+# Scan operators that mean "no usable index for this access path"
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?!.*(?:USING (?:COVERING )?INDEX))')
+MSSQL_SCAN = re.compile(r'PhysicalOp="(Table Scan|Clustered Index Scan)"[^>]*>.*?Table="\[(\w+)\]"', re.S)
+
+MISSING_INDEXES_SQL = """
+SELECT TOP 20 d.statement, d.equality_columns, d.inequality_columns, d.included_columns,
+       s.user_seeks, s.avg_user_impact
+FROM sys.dm_db_missing_index_details d
+JOIN sys.dm_db_missing_index_groups g ON g.index_handle = d.index_handle
+JOIN sys.dm_db_missing_index_group_stats s ON s.group_handle = g.index_group_handle
+WHERE d.database_id = DB_ID()
+ORDER BY s.user_seeks * s.avg_user_impact DESC
+"""
+
+
+def hot_queries():
+    # The lookups the routes run on every request, built from the route helpers themselves
+    from routes.daily_routes import daily_filters
+    from routes.monthly_routes import monthly_filters
+    from routes.branch_source_name import branch_source_names_query
+    from routes.auth_routes import login_query
+    return [
+        ('login by userName', login_query('superadmin')),
+        ('daily by branch and date',
+         Daily.query.filter(*daily_filters(MultiDict({'branchId': '1', 'dateFrom': '2024-01-01'})))),
+        ('branch source names', branch_source_names_query(1, area_id=1)),
+        ('source names by type', SourceName.query.filter(SourceName.sourceTypeId == 1, active(SourceName))),
+        ('monthly by branch and period',
+         Monthly.query.filter(*monthly_filters(MultiDict({'branchId': '1', 'year': '2024', 'month': 'January'})))),
+    ]
+
+
+def _compiled(query, dialect):
+    compiled = query.statement.compile(dialect=dialect)
+    params = compiled.construct_params()
+    return str(compiled), tuple(params[name] for name in compiled.positiontup)
+
+
+def scanned_tables(query):
+    # Tables the plan for `query` reads with a full scan (SQL Server and SQLite)
+    engine = db.engine
+    sql, params = _compiled(query, engine.dialect)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if engine.dialect.name == 'mssql':
+            cursor.execute('SET SHOWPLAN_XML ON')
+            try:
+                cursor.execute(sql, params)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute('SET SHOWPLAN_XML OFF')
+            return sorted({table for _, table in MSSQL_SCAN.findall(plan)})
+        if engine.dialect.name == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return sorted({match.group(1) for match in map(SQLITE_SCAN.match, details) if match})
+        raise click.ClickException(f'Index check does not support {engine.dialect.name}')
+    finally:
+        connection.close()
+
+
+@click.command('check-indexes')
+@with_appcontext
+def check_indexes_command():
+    """Report hot queries that run without an index."""
+    unindexed = 0
+    for name, query in hot_queries():
+        tables = scanned_tables(query)
+        status = 'SCAN ' + ', '.join(tables) if tables else 'ok'
+        unindexed += bool(tables)
+        click.echo(f'{name:<32} {status}')
+
+    if db.engine.dialect.name == 'mssql':
+        rows = db.session.execute(MISSING_INDEXES_SQL).fetchall()
+        if rows:
+            click.echo('\nSQL Server missing-index suggestions:')
+        for statement, equality, inequality, included, seeks, impact in rows:
+            click.echo(f'  {statement} eq=({equality or ""}) ineq=({inequality or ""}) '
+                       f'include=({included or ""}) seeks={seeks} impact={impact:.0f}%')
+
+    if unindexed:
+        raise SystemExit(1)
@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import click
+from flask import current_app, g, json
+from flask.cli import with_appcontext
+from werkzeug.datastructures import MultiDict
+from models import db, Job
+from utils.database import has_replica
+from utils.metrics import JOBS_FINISHED, JOB_DURATION
+
+# kind -> JobKind; plan(params) validates the parameters in the submitting request and returns run(job)
+JOB_KINDS = {}
+
+JobKind = namedtuple('JobKind', 'plan read_replica')
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def job_kind(name, read_replica=True):
+    # Registers a background job. plan(params) gets the submitted parameters as a MultiDict,
+    # raises ValueError for bad input and returns run(job), which executes on the job pool.
+    # Reports read from the replica when one is configured; jobs that read in order to
+    # write should pass read_replica=False.
+    def register(plan):
+        JOB_KINDS[name] = JobKind(plan, read_replica)
+        return plan
+    return register
+
+
+def job_params(data):
+    # JSON body -> MultiDict of strings, so jobs reuse the listing filters (daily_filters etc.)
+    if not isinstance(data, dict):
+        raise ValueError('Job parameters must be a JSON object')
+    params = MultiDict()
+    for key, value in data.items():
+        if isinstance(value, bool):
+            value = '1' if value else '0'
+        elif isinstance(value, (dict, list)):
+            raise ValueError(f'Unsupported value for {key}')
+        if value is not None:
+            params[key] = str(value)
+    return params
+
+
+def _update(job_id, **values):
+    # Job rows are written on their own short transaction, never on the job's session,
+    # so progress commits cannot interfere with a cursor the job is still reading
+    with db.engine.begin() as connection:
+        connection.execute(Job.__table__.update().where(Job.__table__.c.id == job_id).values(**values))
+
+
+class JobContext:
+    # Handed to run(job): parameters, progress reporting and the result file
+
+    def __init__(self, runner, job_id, params):
+        self.runner = runner
+        self.id = job_id
+        self.params = params
+        self._reported_at = 0.0
+
+    def progress(self, fraction):
+        # Throttled to one write per JOB_PROGRESS_INTERVAL; progress is advisory, so a failed
+        # write (e.g. SQLite busy behind the job's own reader) is skipped rather than fatal
+        now = time.monotonic()
+        if now - self._reported_at < self.runner.progress_interval:
+            return
+        self._reported_at = now
+        try:
+            _update(self.id, progress=min(max(fraction, 0.0), 1.0), heartbeatAt=datetime.utcnow())
+        except Exception:
+            current_app.logger.debug('Progress update for job %s skipped', self.id, exc_info=True)
+
+    def track(self, items, total):
+        # Yields items unchanged, reporting progress against an expected total count
+        for done, item in enumerate(items, 1):
+            yield item
+            self.progress(done / total if total else 0.0)
+
+    def write(self, chunks, name, mimetype):
+        # Streams str/bytes chunks into the result file; the download serves it as `name`
+        os.makedirs(self.runner.result_dir, exist_ok=True)
+        path = self.runner.result_path(self.id)
+        partial = f'{path}.part'
+        size = 0
+        with open(partial, 'wb') as result:
+            for chunk in chunks:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                result.write(data)
+                size += len(data)
+        os.replace(partial, path)
+        self.result = {'resultName': name, 'resultType': mimetype, 'resultSize': size}
+
+    def write_json(self, payload, name):
+        self.write([json.dumps(payload)], name, 'application/json')
+
+
+class JobRunner:
+    # Long-running reports run on a small local pool instead of a request thread. Job state
+    # lives in the Job table so any worker process can answer status polls; the work itself
+    # runs in the process that accepted it. At most `max_pending` jobs may be queued or
+    # running per process; beyond that submit() raises JobQueueFull. A heartbeat thread
+    # stamps every job this process holds, so only jobs of a dead process go stale.
+
+    def __init__(self, workers=2, max_pending=32, result_dir='job-results',
+                 progress_interval=1, stale_after=3600):
+        self._executor = None
+        self._active = set()  # ids of jobs queued or running in this process
+        self._active_lock = threading.Lock()
+        self._heartbeat = None
+        self.configure(workers, max_pending, result_dir, progress_interval, stale_after)
+
+    def configure(self, workers, max_pending, result_dir, progress_interval, stale_after):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.result_dir = result_dir
+        self.progress_interval = progress_interval
+        self.stale_after = stale_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def result_path(self, job_id):
+        return os.path.join(self.result_dir, str(job_id))
+
+    def submit(self, job, params, run, read_replica=False):
+        # Commits the queued job row, then schedules run(JobContext) on the pool
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull()
+        try:
+            db.session.add(job)
+            db.session.commit()
+            app = current_app._get_current_object()
+            with self._active_lock:
+                self._active.add(job.id)
+            self._start_heartbeat(app)
+            self._executor.submit(self._run, app, job.id, job.kind, params, run, read_replica)
+        except BaseException:
+            self._slots.release()
+            raise
+        return job
+
+    def _start_heartbeat(self, app):
+        # Started on first use in each process (threads do not survive a gunicorn fork)
+        with self._active_lock:
+            if self._heartbeat is None or not self._heartbeat.is_alive():
+                self._heartbeat = threading.Thread(target=self._beat, args=(app,),
+                                                   name='job-heartbeat', daemon=True)
+                self._heartbeat.start()
+
+    def _beat(self, app):
+        while True:
+            time.sleep(max(min(self.stale_after / 4, 60), 1))
+            with self._active_lock:
+                job_ids = list(self._active)
+            if not job_ids:
+                continue
+            with app.app_context():
+                try:
+                    table = Job.__table__
+                    with db.engine.begin() as connection:
+                        connection.execute(
+                            table.update()
+                            .where(table.c.id.in_(job_ids))
+                            .where(table.c.status.in_(ACTIVE_STATUSES))
+                            .values(heartbeatAt=datetime.utcnow()))
+                except Exception:
+                    app.logger.warning('Job heartbeat failed', exc_info=True)
+
+    def _run(self, app, job_id, kind, params, run, read_replica):
+        started = time.monotonic()
+        status = 'failed'
+        try:
+            with app.app_context():
+                # Job-only writes (_update) use the engine directly and stay on the primary
+                g.read_replica = read_replica and has_replica(app)
+                try:
+                    context = JobContext(self, job_id, params)
+                    now = datetime.utcnow()
+                    _update(job_id, status='running', startedAt=now, heartbeatAt=now)
+                    run(context)
+                    status = 'succeeded'
+                    _update(job_id, status=status, progress=1.0, finishedAt=datetime.utcnow(),
+                            **getattr(context, 'result', {}))
+                except Exception as e:
+                    app.logger.exception('Job %s (%s) failed', job_id, kind)
+                    db.session.rollback()
+                    _update(job_id, status=status, message=str(e)[:512] or type(e).__name__,
+                            finishedAt=datetime.utcnow())
+        finally:
+            with self._active_lock:
+                self._active.discard(job_id)
+            self._slots.release()
+            JOBS_FINISHED.inc((kind, status))
+            JOB_DURATION.observe((kind,), time.monotonic() - started)
+
+    def expire_stale(self, job):
+        # A queued/running job without a heartbeat belongs to a process that died or restarted
+        if job.status in ACTIVE_STATUSES and job.heartbeatAt is not None \
+                and datetime.utcnow() - job.heartbeatAt > timedelta(seconds=self.stale_after):
+            job.status = 'failed'
+            job.message = 'Job was interrupted before it finished'
+            job.finishedAt = datetime.utcnow()
+            db.session.commit()
+        return job
+
+
+job_runner = JobRunner()
+
+def init_jobs(app):
+    job_runner.configure(
+        workers=app.config.get('JOB_WORKERS', 2),
+        max_pending=app.config.get('JOB_MAX_PENDING', 32),
+        result_dir=app.config.get('JOB_RESULT_DIR') or os.path.join(app.instance_path, 'job-results'),
+        progress_interval=app.config.get('JOB_PROGRESS_INTERVAL', 1),
+        stale_after=app.config.get('JOB_STALE_AFTER', 3600)
+    )
+
+
+@click.command('purge-jobs')
+@click.option('--days', default=7, show_default=True, help='Remove finished jobs older than this.')
+@with_appcontext
+def purge_jobs_command(days):
+    """Delete finished jobs and their result files."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    jobs = Job.query.filter(Job.status.notin_(ACTIVE_STATUSES), Job.createdAt < cutoff).all()
+    for job in jobs:
+        path = job_runner.result_path(job.id)
+        if os.path.exists(path):
+            os.remove(path)
+        db.session.delete(job)
+    db.session.commit()
+    click.echo(f'Removed {len(jobs)} job(s)')
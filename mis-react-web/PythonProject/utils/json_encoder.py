@@ -0,0 +1,30 @@
+from flask.json import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # falls back to Flask's stdlib-based encoder
+    orjson = None
+
+if orjson is not None:
+    # Dates and datetimes pass through to JSONEncoder.default(), so they keep Flask's
+    # HTTP-date format ("Sat, 17 Oct 2026 00:00:00 GMT") that the React client parses
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonEncoder(JSONEncoder):
+    # Flask 2.0 has no JSON provider hook, but jsonify and flask.json.dumps both end in
+    # encoder.encode(), so replacing it moves every response onto orjson. default()
+    # still covers dates, Decimal, UUID and other types orjson does not know.
+    def encode(self, o):
+        if orjson is None:
+            return super().encode(o)
+        option = ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(o, default=self.default, option=option).decode('utf-8')
+
+
+def init_json(app):
+    app.json_encoder = OrjsonEncoder
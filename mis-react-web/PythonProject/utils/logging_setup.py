@@ -0,0 +1,125 @@
+import atexit
+import logging
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue, Full
+from flask import has_request_context, request
+from flask.logging import default_handler
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+
+class Payload:
+    # Wraps a large value passed as a logging argument; it is only turned into text
+    # (truncated) if the record is actually written, and then on the writer thread
+
+    def __init__(self, value, max_items=20, max_chars=2000):
+        self.value = value
+        self.max_items = max_items
+        self.max_chars = max_chars
+
+    def __str__(self):
+        value = self.value
+        if isinstance(value, (list, tuple)) and len(value) > self.max_items:
+            text = f'{list(value[:self.max_items])!r} ... ({len(value) - self.max_items} more items)'
+        else:
+            text = repr(value)
+        if len(text) > self.max_chars:
+            text = f'{text[:self.max_chars]}... ({len(text)} chars)'
+        return text
+
+
+class RouteLevelFilter(logging.Filter):
+    # Per-endpoint minimum levels (LOG_ROUTE_LEVELS), falling back to the global level
+    def __init__(self, default_level, route_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.route_levels = route_levels
+
+    def filter(self, record):
+        level = self.default_level
+        if has_request_context() and request.endpoint in self.route_levels:
+            level = self.route_levels[request.endpoint]
+        return record.levelno >= level
+
+
+class SamplingFilter(logging.Filter):
+    # Keeps a fraction of DEBUG/INFO records; warnings and errors always pass
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    # The request thread only appends to a bounded queue; formatting and I/O happen on
+    # the listener thread. When the queue is full records are dropped, never waited on.
+    dropped = 0
+
+    def prepare(self, record):
+        # Keep msg/args unformatted so Payload arguments render on the writer thread;
+        # tracebacks are rendered now because they reference live frames
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+def parse_level(name, setting):
+    # getLevelName() answers 'Level FOO' for an unknown name instead of failing
+    level = logging.getLevelName(name.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f'{setting}: unknown log level {name.strip()!r}, '
+                         'expected DEBUG, INFO, WARNING, ERROR or CRITICAL')
+    return level
+
+
+def parse_route_levels(value):
+    # "auth.login=DEBUG,branch_source_name.get_branch_source_names=WARNING"
+    levels = {}
+    for item in filter(None, (part.strip() for part in (value or '').split(','))):
+        endpoint, _, level = item.partition('=')
+        levels[endpoint.strip()] = parse_level(level, 'LOG_ROUTE_LEVELS')
+    return levels
+
+
+def init_logging(app):
+    level = parse_level(app.config.get('LOG_LEVEL', 'INFO'), 'LOG_LEVEL')
+    route_levels = parse_route_levels(app.config.get('LOG_ROUTE_LEVELS'))
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RouteLevelFilter(level, route_levels))
+    handler.addFilter(SamplingFilter(app.config.get('LOG_SAMPLE_RATE', 1.0)))
+
+    # Loggers pass everything the most verbose route wants; the handler filters decide
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(min([level, *route_levels.values()]))
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(logging.NOTSET)
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def request_summary():
+    # Debug view of the current request with credentials stripped
+    headers = {key: ('<redacted>' if key.lower() in ('authorization', 'cookie') else value)
+               for key, value in request.headers.items()}
+    return {'method': request.method, 'url': request.url, 'headers': headers}
@@ -0,0 +1,238 @@
+import threading
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+JOB_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", bound)])} {bucket_count}')
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", "+Inf")])} {count}')
+                lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total}')
+                lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {count}')
+        return lines
+
+
+class Gauge:
+    # Sampled at scrape time from collect(), which returns {labels: value}
+    def __init__(self, name, documentation, labelnames, collect):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+def _pool_connections():
+    from flask import current_app
+    from utils.database import pool_status
+    return {(bind, state): value
+            for bind, states in pool_status(current_app).items()
+            for state, value in states.items()}
+
+
+REQUEST_LATENCY = Histogram(
+    'mis_http_request_duration_seconds', 'Request latency by route.',
+    ('endpoint', 'method', 'status'))
+REQUEST_QUERIES = Histogram(
+    'mis_http_request_sql_queries', 'SQL statements executed per request.',
+    ('endpoint',), QUERY_COUNT_BUCKETS)
+SQL_QUERIES = Counter('mis_sql_queries_total', 'SQL statements executed.', ('endpoint',))
+SQL_TIME = Counter('mis_sql_query_seconds_total', 'Time spent executing SQL statements.', ('endpoint',))
+SQL_ROWS = Counter(
+    'mis_sql_rows_total', 'Rows fetched from SELECT results, ORM instances loaded and DML rows affected.',
+    ('endpoint', 'kind'))
+POOL_WAIT = Histogram(
+    'mis_db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection.',
+    (), WAIT_BUCKETS)
+POOL_CONNECTIONS = Gauge(
+    'mis_db_pool_connections', 'Pooled connections per bind (size, checked_in, checked_out, overflow).',
+    ('bind', 'state'), _pool_connections)
+JOBS_FINISHED = Counter('mis_jobs_finished_total', 'Background jobs finished, by outcome.', ('kind', 'status'))
+JOB_DURATION = Histogram(
+    'mis_job_duration_seconds', 'Background job run time.', ('kind',), JOB_BUCKETS)
+
+REGISTRY = [REQUEST_LATENCY, REQUEST_QUERIES, SQL_QUERIES, SQL_TIME, SQL_ROWS, POOL_WAIT, POOL_CONNECTIONS,
+            JOBS_FINISHED, JOB_DURATION]
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _endpoint():
+    # Statements outside a request (CLI, background jobs) are reported under "-"
+    return (request.endpoint or 'unmatched') if has_request_context() else '-'
+
+
+class _CountingCursor:
+    # DBAPI cursor proxy counting the rows the result fetches, whatever reads them (ORM
+    # queries, column-only selects, streamed exports); the endpoint is fixed at execution
+    # because streamed rows may be fetched after the request context is gone
+
+    def __init__(self, cursor, endpoint):
+        self._cursor = cursor
+        self._endpoint = endpoint
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _count(self, rows):
+        if rows:
+            SQL_ROWS.inc((self._endpoint, 'fetched'), len(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            SQL_ROWS.inc((self._endpoint, 'fetched'))
+        return row
+
+    def fetchmany(self, *args):
+        return self._count(self._cursor.fetchmany(*args))
+
+    def fetchall(self):
+        return self._count(self._cursor.fetchall())
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append((cursor, time.perf_counter()))
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()[1]
+    endpoint = _endpoint()
+    SQL_QUERIES.inc((endpoint,))
+    SQL_TIME.inc((endpoint,), elapsed)
+    if cursor.description is not None and context is not None:
+        context.cursor = _CountingCursor(cursor, endpoint)  # the result reads context.cursor
+    elif cursor.rowcount and cursor.rowcount > 0:
+        SQL_ROWS.inc((endpoint, 'affected'), cursor.rowcount)
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + 1
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so the
+    # next statement on this connection is not timed against it
+    connection, context = exception_context.connection, exception_context.execution_context
+    started = connection.info.get('query_started') if connection is not None else None
+    cursor = exception_context.cursor or (context.cursor if context is not None else None)
+    if started and cursor is not None and started[-1][0] is cursor:
+        started.pop()
+
+
+def _on_load(target, context):
+    SQL_ROWS.inc((_endpoint(), 'loaded'))
+
+
+def count_loaded_rows(model_base):
+    # Every ORM instance materialized from a result row (the N+1 signal); once per process
+    if not event.contains(model_base, 'load', _on_load):
+        event.listen(model_base, 'load', _on_load, propagate=True)
+
+
+class TimedQueuePool(QueuePool):
+    # QueuePool that records how long each checkout waited for a free connection
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe((), time.perf_counter() - started)
+
+
+def init_metrics(app):
+    from models import db
+    count_loaded_rows(db.Model)
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _remember_status(response):
+        g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _record_request(exc):
+        # Teardown runs after streamed bodies finish, so NDJSON/CSV exports are timed in full
+        started = g.pop('request_started', None)
+        if started is None:
+            return
+        endpoint = request.endpoint or 'unmatched'
+        status = 500 if exc is not None else g.pop('response_status', 500)
+        REQUEST_LATENCY.observe((endpoint, request.method, str(status)), time.perf_counter() - started)
+        REQUEST_QUERIES.observe((endpoint,), g.pop('sql_queries', 0))
@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def page_size(value):
+    # Clamp the requested page size; anything unparsable falls back to the default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(date, row_id):
+    raw = json.dumps([date.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token):
+    # Raises ValueError for anything that is not a cursor we handed out
+    try:
+        date, row_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        return datetime.fromisoformat(date), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
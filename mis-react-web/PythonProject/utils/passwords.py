@@ -0,0 +1,93 @@
+import hmac
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import bcrypt
+
+# $2b$12$ + 22 salt + 31 hash characters. Anything else stored (a legacy plaintext that
+# happens to start with "$2", a truncated hash) is compared as plaintext: bcrypt rejects
+# such values with ValueError, or a panic for some truncations, instead of a mismatch.
+BCRYPT_HASH = re.compile(r'\$2[abxy]?\$\d\d\$[./A-Za-z0-9]{53}')
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    # bcrypt work runs on a small dedicated pool (bcrypt releases the GIL), so a burst of
+    # logins is capped at `workers` CPU-bound hashes and cannot starve the other endpoints.
+    # At most `max_pending` hashes may be queued or running; beyond that callers get
+    # PasswordPoolBusy at once, as they do when a result takes longer than `timeout`.
+
+    def __init__(self, rounds=12, workers=2, max_pending=64, timeout=10):
+        self._executor = None
+        self.configure(rounds, workers, max_pending, timeout)
+
+    def configure(self, rounds, workers, max_pending, timeout):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Checked when the user does not exist, so both paths cost one bcrypt verification
+        self._dummy_hash = None
+
+    def hash(self, password):
+        return self._submit(self._hash, password)
+
+    def verify(self, password, stored):
+        # -> (matches, replacement hash or None when the stored value is already current)
+        return self._submit(self._verify, password, stored)
+
+    def _submit(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is held until the hash itself finishes, even if this caller stops waiting
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise PasswordPoolBusy()
+
+    def _hash(self, password):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('ascii')
+
+    def _verify(self, password, stored):
+        if not stored:
+            if self._dummy_hash is None:
+                self._dummy_hash = self._hash('dummy')
+            bcrypt.checkpw(password.encode('utf-8'), self._dummy_hash.encode('ascii'))
+            return False, None
+        if BCRYPT_HASH.fullmatch(stored):
+            try:
+                matched = bcrypt.checkpw(password.encode('utf-8'), stored.encode('ascii'))
+            except ValueError:
+                matched = None  # well-formed but unusable, e.g. a cost outside 4-31
+            if matched is not None:
+                if not matched:
+                    return False, None
+                rounds = int(stored.split('$')[2])
+                return True, (self._hash(password) if rounds != self.rounds else None)
+        # Legacy plaintext value: accept once and hand back a bcrypt hash to store
+        if hmac.compare_digest(stored.encode('utf-8'), password.encode('utf-8')):
+            return True, self._hash(password)
+        return False, None
+
+
+password_hasher = PasswordHasher()
+
+def init_password_hasher(app):
+    password_hasher.configure(
+        rounds=app.config.get('BCRYPT_ROUNDS', 12),
+        workers=app.config.get('PASSWORD_WORKERS', 2),
+        max_pending=app.config.get('PASSWORD_MAX_PENDING', 64),
+        timeout=app.config.get('PASSWORD_TIMEOUT', 10)
+    )
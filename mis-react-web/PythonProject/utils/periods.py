@@ -0,0 +1,35 @@
+from sqlalchemy import Date, cast, func, literal_column
+from models import db
+
+PERIODS = ('day', 'week', 'month')
+
+
+def period_expression(column, period):
+    # SQL expression truncating a datetime column to the start of its day, week (Monday) or month
+    dialect = db.engine.dialect.name
+    if dialect == 'mssql':
+        # Constants are inlined: SQL Server matches GROUP BY to the select list by text, and
+        # bound parameters would make the two copies of the expression differ
+        if period == 'day':
+            return cast(column, Date)
+        if period == 'week':
+            # 1900-01-01 (day 0) was a Monday, so whole 7-day steps from it land on Mondays
+            days = func.datediff(literal_column('day'), literal_column('0'), column)
+            week = (days / literal_column('7')) * literal_column('7')
+            return cast(func.dateadd(literal_column('day'), week, literal_column('0')), Date)
+        return func.datefromparts(func.year(column), func.month(column), literal_column('1'))
+    if dialect == 'sqlite':
+        if period == 'day':
+            return func.date(column)
+        if period == 'week':
+            return func.date(column, 'weekday 0', '-6 days')
+        return func.strftime('%Y-%m-01', column)
+    return cast(func.date_trunc(period, column), Date)
+
+
+def format_period(value):
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()[:10]
+    return str(value)
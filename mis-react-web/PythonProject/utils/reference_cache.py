@@ -0,0 +1,158 @@
+import hashlib
+from functools import wraps
+from flask import Response, current_app, request
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import db, CacheVersion
+from utils.cache import TTLCache
+from utils.compression import response_compressor
+
+
+class CachedBody:
+    __slots__ = ('version', 'body', 'etag', 'variants')
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.variants = {}
+
+    def encoded(self, encoding):
+        # Compressed once at the best level, then reused until the entry is replaced
+        data = self.variants.get(encoding)
+        if data is None:
+            data = self.variants[encoding] = response_compressor.compress(self.body, encoding, best=True)
+        return data
+
+
+def _version_name(key):
+    # 'Area', ('branch', 12) -> 'branch:12'
+    return ':'.join(str(part) for part in key) if isinstance(key, tuple) else key
+
+
+class ReferenceCache:
+    # Serialized bodies of small lookup tables, valid while the versions of the
+    # tables they were built from are unchanged. Versions live in the CacheVersion
+    # table, so a write committed through any worker invalidates every worker's copy;
+    # each lookup costs one primary-key read. Bodies live in a bounded LRU per
+    # process, so unusual query strings cannot grow it without limit.
+
+    def __init__(self, maxsize=256, ttl=300):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def configure(self, maxsize=None, ttl=None):
+        self._entries.configure(maxsize=maxsize, ttl=ttl)
+
+    def version(self, tables):
+        # Read on the request's session, so the versions come from the same database
+        # (primary or replica) as the rows the body is built from
+        names = [_version_name(table) for table in tables]
+        column = CacheVersion.__table__.c
+        rows = dict(db.session.execute(
+            select([column.name, column.version]).where(column.name.in_(names))).fetchall())
+        return tuple(rows.get(name, 0) for name in names)
+
+    def bump(self, *tables):
+        # Each name on its own short transaction; two workers creating the same row race
+        # on the insert, and the loser bumps the winner's row instead
+        table = CacheVersion.__table__
+        for name in sorted(_version_name(key) for key in tables):
+            bump = table.update().where(table.c.name == name).values(version=table.c.version + 1)
+            try:
+                with db.engine.begin() as connection:
+                    if not connection.execute(bump).rowcount:
+                        connection.execute(table.insert().values(name=name, version=1))
+            except IntegrityError:
+                with db.engine.begin() as connection:
+                    connection.execute(bump)
+
+    def get(self, key, version):
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        return entry
+
+    def put(self, key, version, body):
+        entry = CachedBody(version, body)
+        self._entries.set(key, entry)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+
+reference_cache = ReferenceCache()
+
+def init_reference_cache(app):
+    reference_cache.configure(maxsize=app.config.get('REFERENCE_CACHE_SIZE'), ttl=app.config.get('REFERENCE_CACHE_TTL'))
+
+def _table_name(model):
+    return model.__table__.name
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault('reference_changes', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        changed.add(_table_name(type(instance)))
+
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_tables(session):
+    # Bump only once the rows are visible to other sessions, so a concurrent reader
+    # can never cache pre-commit data under the new version
+    changed = session.info.pop('reference_changes', None)
+    if changed:
+        bump_versions(reference_cache, changed)
+
+def bump_versions(cache, changed):
+    # The rows are already committed; a failed bump leaves other workers' copies stale
+    # until REFERENCE_CACHE_TTL expires them, which is logged rather than raised
+    try:
+        cache.bump(*changed)
+    except Exception:
+        current_app.logger.warning('Cache version bump failed for %s', sorted(map(str, changed)), exc_info=True)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_tables(session):
+    session.info.pop('reference_changes', None)
+
+def mark_changed(session, *models):
+    # For writes that skip the unit of work (bulk_insert_mappings, Core executemany)
+    session.info.setdefault('reference_changes', set()).update(_table_name(model) for model in models)
+
+def cached_json(cache, key, version, build):
+    # Serve a cached JSON body with an ETag (precompressed per encoding); build() only
+    # runs on a miss, and anything but a 200 Response from it passes through uncached
+    entry = cache.get(key, version)
+    if entry is None:
+        response = build()
+        if not isinstance(response, Response) or response.status_code != 200:
+            return response
+        entry = cache.put(key, version, response.get_data())
+    encoding = response_compressor.negotiate() if len(entry.body) >= response_compressor.min_size else None
+    if encoding:
+        response = Response(entry.encoded(encoding), mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f'{entry.etag}-{encoding}')
+    else:
+        response = Response(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+def reference_data(*models):
+    # The view body only runs when one of `models` changed since the cached copy was built.
+    # ?since= deltas are never cached: every sync carries a new token, so they never repeat.
+    tables = [_table_name(model) for model in models]
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.args.get('since'):
+                return f(*args, **kwargs)
+            key = (request.endpoint, request.query_string)
+            version = reference_cache.version(tables)
+            return cached_json(reference_cache, key, version, lambda: f(*args, **kwargs))
+        return decorated
+    return decorator
@@ -0,0 +1,61 @@
+from operator import attrgetter, itemgetter
+
+# (model, fields) -> function(instance) -> dict, built once from the mapped columns
+_serializers = {}
+
+
+def serializer(model, fields=None):
+    # fields: optional tuple of column keys (a sparse view); defaults to every column not
+    # listed in the model's __serialize_exclude__
+    key = (model, fields)
+    serialize = _serializers.get(key)
+    if serialize is None:
+        serialize = _serializers[key] = _build(model, fields)
+    return serialize
+
+
+def column_keys(model):
+    exclude = getattr(model, '__serialize_exclude__', ())
+    return tuple(prop.key for prop in model.__mapper__.column_attrs if prop.key not in exclude)
+
+
+def _build(model, fields):
+    keys = tuple(fields) if fields is not None else column_keys(model)
+    # itemgetter/attrgetter with several names return a tuple; a single name does not
+    from_state = itemgetter(*keys)
+    from_attributes = attrgetter(*keys)
+    single = len(keys) == 1
+
+    def serialize(instance):
+        # Loaded column values live in __dict__; expired or deferred ones (e.g. after a
+        # commit) are missing there and go through the instrumented attributes instead
+        try:
+            values = from_state(instance.__dict__)
+        except KeyError:
+            values = from_attributes(instance)
+        if single:
+            return {keys[0]: values}
+        return dict(zip(keys, values))
+
+    return serialize
+
+
+def parse_fields(model, value, required=('id',)):
+    # ?fields=date,sourceName -> ('id', 'date', 'sourceName'); None when absent.
+    # Raises ValueError naming any key that is not a serializable column.
+    if not value:
+        return None
+    requested = [name.strip() for name in value.split(',') if name.strip()]
+    known = column_keys(model)
+    unknown = [name for name in requested if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    keys = list(required)
+    keys.extend(name for name in requested if name not in keys)
+    return tuple(keys)
+
+
+def row_serializer(keys):
+    # For column-only selects: rows arrive in select order, and any trailing columns
+    # beyond `keys` (e.g. pagination keys) are dropped by zip
+    return lambda row: dict(zip(keys, row))
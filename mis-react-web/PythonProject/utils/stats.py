@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import Counter
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+from models import db, active, User, Area, Branch, Daily, Monthly, Status
+
+# Which counter a row contributes to, given the listed column values (None = no counter)
+COUNTED_MODELS = {
+    User: (('isActive',), lambda is_active: 'ActiveUsers' if is_active else None),
+    Area: ((), lambda: 'Areas'),
+    Branch: ((), lambda: 'Branches'),
+    Daily: (('status', 'isActive'), lambda status, is_active: _status_key('Daily', status, is_active)),
+    Monthly: (('status', 'isActive'), lambda status, is_active: _status_key('Monthly', status, is_active)),
+}
+
+# Status names mapped onto the dashboard cards
+STATUS_CARDS = {'Accepted': 'Approved', 'Pending': 'Pending', 'Rejected': 'Declined'}
+
+def _status_key(table, status, is_active):
+    # Only isActive = 1 rows count, as in the listings (models.active); NULL is not active
+    if not is_active:
+        return None
+    return (table, str(status) if status is not None else None)
+
+
+class DashboardStats:
+    # Dashboard counters kept current from committed ORM writes and periodically
+    # recounted from the database to correct any drift (raw SQL, other workers)
+
+    def __init__(self, reconcile_interval=300):
+        self.reconcile_interval = reconcile_interval
+        self._counts = Counter()
+        self._status_names = {}
+        self._reconciled_at = None
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()  # one recount at a time
+
+    def apply(self, deltas):
+        with self._lock:
+            if self._reconciled_at is not None:
+                self._counts.update(deltas)
+
+    def reconcile(self):
+        counts = Counter()
+        counts['ActiveUsers'] = User.query.filter_by(isActive=True).count()
+        counts['Areas'] = Area.query.count()
+        counts['Branches'] = Branch.query.count()
+        for model, table in ((Daily, 'Daily'), (Monthly, 'Monthly')):
+            rows = (
+                db.session.query(model.status, func.count(model.id))
+                .filter(active(model))
+                .group_by(model.status)
+                .all()
+            )
+            for status, total in rows:
+                counts[_status_key(table, status, True)] = total
+        status_names = {str(s.id): s.statusName for s in Status.query.all()}
+        with self._lock:
+            self._counts = counts
+            self._status_names = status_names
+            self._reconciled_at = time.monotonic()
+
+    def _stale(self):
+        with self._lock:
+            return (self._reconciled_at is None
+                    or time.monotonic() - self._reconciled_at > self.reconcile_interval)
+
+    def refresh(self):
+        # Single flight: one caller recounts while the others keep serving the previous
+        # counts; only the very first snapshot, with nothing to serve yet, waits for it
+        if not self._reconcile_lock.acquire(blocking=self._reconciled_at is None):
+            return
+        try:
+            if self._stale():  # another caller may have recounted while this one waited
+                self.reconcile()
+        finally:
+            self._reconcile_lock.release()
+
+    def snapshot(self):
+        if self._stale():
+            self.refresh()
+        with self._lock:
+            counts = dict(self._counts)
+            status_names = dict(self._status_names)
+
+        result = {
+            'ActiveUsers': counts.get('ActiveUsers', 0),
+            'Areas': counts.get('Areas', 0),
+            'Branches': counts.get('Branches', 0),
+            'Approved': 0,
+            'Pending': 0,
+            'Declined': 0,
+            'Encoded': 0,
+            'Daily': {},
+            'Monthly': {},
+        }
+        for key, total in counts.items():
+            if not isinstance(key, tuple) or total == 0:
+                continue
+            table, status = key
+            # Both tables store Status ids; report them by name (an unknown id as-is)
+            name = status_names.get(status, status)
+            result[table][name] = result[table].get(name, 0) + total
+            result['Encoded'] += total
+            if name in STATUS_CARDS:
+                result[STATUS_CARDS[name]] += total
+        return result
+
+
+dashboard_stats = DashboardStats()
+
+def init_dashboard_stats(app):
+    dashboard_stats.reconcile_interval = app.config.get(
+        'DASHBOARD_RECONCILE_INTERVAL', dashboard_stats.reconcile_interval)
+
+def _pending_deltas(session):
+    return session.info.setdefault('stats_deltas', Counter())
+
+def record_rows(session, model, rows):
+    # For inserts that skip the unit of work (Core executemany of plain dicts)
+    columns, key_for = COUNTED_MODELS[model]
+    deltas = _pending_deltas(session)
+    for row in rows:
+        key = key_for(*(row.get(column) for column in columns))
+        if key is not None:
+            deltas[key] += 1
+
+def _values(instance, columns, previous):
+    state = inspect(instance)
+    values = []
+    for column in columns:
+        history = state.attrs[column].history
+        if previous and history.deleted:
+            values.append(history.deleted[0])
+        else:
+            values.append(getattr(instance, column))
+    return values
+
+@event.listens_for(Session, 'after_flush')
+def _collect_deltas(session, flush_context):
+    deltas = _pending_deltas(session)
+    for instance in session.new:
+        if type(instance) in COUNTED_MODELS:
+            columns, key_for = COUNTED_MODELS[type(instance)]
+            deltas[key_for(*_values(instance, columns, False))] += 1
+    for instance in session.deleted:
+        if type(instance) in COUNTED_MODELS:
+            columns, key_for = COUNTED_MODELS[type(instance)]
+            deltas[key_for(*_values(instance, columns, True))] -= 1
+    for instance in session.dirty:
+        if type(instance) in COUNTED_MODELS:
+            columns, key_for = COUNTED_MODELS[type(instance)]
+            before = key_for(*_values(instance, columns, True))
+            after = key_for(*_values(instance, columns, False))
+            if before != after:
+                deltas[before] -= 1
+                deltas[after] += 1
+    deltas.pop(None, None)
+
+@event.listens_for(Session, 'after_commit')
+def _apply_deltas(session):
+    deltas = session.info.pop('stats_deltas', None)
+    if deltas:
+        dashboard_stats.apply(deltas)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deltas(session):
+    session.info.pop('stats_deltas', None)
@@ -0,0 +1,29 @@
+from flask import Response, json, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_SIZE = 1000
+
+
+def wants_stream():
+    # ?stream=1 or an explicit NDJSON Accept header; plain */* keeps the JSON response
+    if request.args.get('stream') == '1':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_response(query, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    # yield_per fetches from a streaming cursor chunk by chunk, so only one chunk of
+    # ORM objects and encoded lines is alive at any time
+    rows = query.enable_eagerloads(False).yield_per(chunk_size)
+
+    def generate():
+        buffer = []
+        for row in rows:
+            buffer.append(json.dumps(serialize(row)))
+            if len(buffer) >= chunk_size:
+                yield '\n'.join(buffer) + '\n'
+                buffer = []
+        if buffer:
+            yield '\n'.join(buffer) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)